@@ -1,7 +1,9 @@
 """Channel registry for multi-channel/multi-repo support."""
 
+import atexit
 import logging
 import os
+import sys
 import threading
 from dataclasses import dataclass
 from typing import Dict, Optional
@@ -11,14 +13,23 @@ logger = logging.getLogger(__name__)
 # Fallback global state file for backward compatibility
 GLOBAL_CHANNEL_STATE_FILE = os.path.expanduser("~/.claude/hooks/.current_channel")
 
+# Delay before writing the state file, so a burst of channel switches
+# results in a single write of the latest channel
+STATE_WRITE_DELAY = 0.05
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class ChannelContext:
     """Context information for a channel."""
 
     channel_id: str
     repo_path: str
     channel_name: str
+    queue_key: str = ""  # Interned message queue session key
+
+
+# Returned for unregistered channels so lookups need no None check
+_EMPTY = ChannelContext(channel_id="", repo_path="", channel_name="")
 
 
 class ChannelRegistry:
@@ -26,8 +37,20 @@ class ChannelRegistry:
 
     def __init__(self) -> None:
         self._channels: Dict[str, ChannelContext] = {}
+        # channel_id -> repo_path, kept alongside _channels for hot-path lookups
+        self._repo_cache: Dict[str, str] = {}
+        # Queue keys handed out for unregistered channels, so each channel
+        # always gets the same interned key
+        self._unregistered_keys: Dict[str, str] = {}
+        # Plain attribute reads/writes are atomic under the GIL; the lock
+        # only serializes writes to the state file
         self._current_channel: Optional[str] = None
-        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        # State file is opened once and rewritten in place on each switch
+        self._state_fd: Optional[int] = None
+        self._write_buf = bytearray(64)
+        self._pending_channel: Optional[str] = None
+        self._flush_timer: Optional[threading.Timer] = None
 
     def register_channel(
         self, channel_id: str, repo_path: str, name: str = ""
@@ -37,18 +60,28 @@ class ChannelRegistry:
             channel_id=channel_id,
             repo_path=repo_path,
             channel_name=name,
+            queue_key=sys.intern(f"channel-{channel_id}"),
         )
+        self._repo_cache[channel_id] = repo_path
         logger.info(f"Registered channel {channel_id} -> {repo_path}")
 
     def get_repo_for_channel(self, channel_id: str) -> Optional[str]:
         """Get the repo path for a channel."""
-        ctx = self._channels.get(channel_id)
-        return ctx.repo_path if ctx else None
+        return self._repo_cache.get(channel_id)
 
     def get_channel_name(self, channel_id: str) -> str:
         """Get the friendly name for a channel."""
-        ctx = self._channels.get(channel_id)
-        return ctx.channel_name if ctx else ""
+        return self._channels.get(channel_id, _EMPTY).channel_name
+
+    def get_queue_key(self, channel_id: str) -> str:
+        """Get the message queue session key for a channel."""
+        key = self._channels.get(channel_id, _EMPTY).queue_key
+        if not key:
+            key = self._unregistered_keys.get(channel_id)
+            if key is None:
+                key = sys.intern(f"channel-{channel_id}")
+                self._unregistered_keys[channel_id] = key
+        return key
 
     def is_registered_channel(self, channel_id: str) -> bool:
         """Check if a channel is registered."""
@@ -56,17 +89,32 @@ class ChannelRegistry:
 
     def set_current_channel(self, channel_id: str) -> None:
         """Set the current active channel for response routing."""
-        with self._lock:
-            self._current_channel = channel_id
-            # Get repo path for this channel to write state to per-repo location
-            repo_path = self.get_repo_for_channel(channel_id)
-            self._write_channel_state(channel_id, repo_path)
-            logger.debug(f"Set current channel to {channel_id} (repo: {repo_path})")
+        self._current_channel = channel_id
+        with self._write_lock:
+            self._pending_channel = channel_id
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(
+                    STATE_WRITE_DELAY, self.flush_channel_state
+                )
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        logger.debug(f"Set current channel to {channel_id}")
 
     def get_current_channel(self) -> Optional[str]:
         """Get the current active channel."""
-        with self._lock:
-            return self._current_channel
+        return self._current_channel
+
+    def flush_channel_state(self) -> None:
+        """Write any pending channel switch to the state file immediately."""
+        with self._write_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            channel_id, self._pending_channel = self._pending_channel, None
+            if channel_id is not None:
+                # Get repo path for this channel to write state to per-repo location
+                repo_path = self.get_repo_for_channel(channel_id)
+                self._write_channel_state(channel_id, repo_path)
 
     def _write_channel_state(
         self, channel_id: str, repo_path: Optional[str] = None
@@ -79,12 +127,39 @@ class ChannelRegistry:
         """
         state_file = GLOBAL_CHANNEL_STATE_FILE
         try:
-            os.makedirs(os.path.dirname(state_file), exist_ok=True)
-            with open(state_file, "w") as f:
-                f.write(channel_id)
+            if self._state_fd is not None and os.fstat(self._state_fd).st_nlink == 0:
+                # The file was deleted or replaced; writing to the old inode
+                # would never reach the hook, so open the path again
+                self._close_state_fd()
+            if self._state_fd is None:
+                os.makedirs(os.path.dirname(state_file), exist_ok=True)
+                self._state_fd = os.open(
+                    state_file, os.O_WRONLY | os.O_CREAT, 0o644
+                )
+                atexit.register(self._close_state_fd)
+            data = channel_id.encode("utf-8")
+            n = len(data)
+            if n > len(self._write_buf):
+                self._write_buf = bytearray(n)
+            self._write_buf[:n] = data
+            os.pwrite(self._state_fd, memoryview(self._write_buf)[:n], 0)
+            os.ftruncate(self._state_fd, n)
             logger.debug(f"Wrote channel state to {state_file}")
         except OSError as e:
             logger.error(f"Failed to write channel state to {state_file}: {e}")
+            # Start from a fresh open on the next write
+            self._close_state_fd()
+
+    def _close_state_fd(self) -> None:
+        """Close the cached state file descriptor, if open."""
+        fd, self._state_fd = self._state_fd, None
+        if fd is None:
+            return
+        atexit.unregister(self._close_state_fd)
+        try:
+            os.close(fd)
+        except OSError:
+            pass
 
     def get_all_channels(self) -> Dict[str, ChannelContext]:
         """Get all registered channels."""
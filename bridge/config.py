@@ -1,10 +1,14 @@
-"""Configuration management for the Claude Slack Bridge."""
+"""Configuration management for the Claude Slack Bridge.
 
+PyYAML is imported lazily when a config file is actually parsed;
+pydantic and pydantic-settings are still required at import time.
+"""
+
+import copy
 import os
 from pathlib import Path
-from typing import Dict, List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
-import yaml
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings
 
@@ -15,6 +19,8 @@ class SlackConfig(BaseModel):
     bot_token: str = ""
     app_token: str = ""
     allowed_user_ids: List[str] = Field(default_factory=list)
+    post_coalesce_ms: int = 500  # Window for batching status notices, 0 to disable
+    post_coalesce_max: int = 20  # Notices per batch before posting immediately
 
 
 class BridgeConfig(BaseModel):
@@ -23,6 +29,12 @@ class BridgeConfig(BaseModel):
     host: str = "0.0.0.0"
     port: int = 9876
     api_key: str = ""  # Optional API key for hook authentication
+    queue_max: int = 100  # Max pending messages per channel, 0 for unbounded
+    coalesce_messages: bool = False  # Send queued bursts as one Claude input
+    # Unix socket the hook script uses instead of HTTP, "" to disable
+    hook_socket: str = "~/.claude/hooks/.bridge.sock"
+    # Directory the hook script spools events to, "" to disable
+    hook_spool: str = "~/.claude/hooks/spool"
 
 
 class FormattingConfig(BaseModel):
@@ -67,6 +79,33 @@ class Config(BaseSettings):
         extra = "ignore"
 
 
+# Parsed YAML keyed by path -> (mtime, size, data), so repeated loads of an
+# unchanged file skip the parse
+_YAML_CACHE: Dict[str, Tuple[float, int, Dict[str, Any]]] = {}
+
+
+def _load_yaml(config_path: str) -> Dict[str, Any]:
+    """Load a YAML file, reusing the cached parse if the file is unchanged."""
+    try:
+        st = os.stat(config_path)
+    except FileNotFoundError:
+        return {}
+
+    cached = _YAML_CACHE.get(config_path)
+    if cached and cached[0] == st.st_mtime and cached[1] == st.st_size:
+        return copy.deepcopy(cached[2])
+
+    import yaml
+
+    # Prefer the libyaml C loader when PyYAML was built with it
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(config_path) as f:
+        data = yaml.load(f, Loader=loader) or {}
+
+    _YAML_CACHE[config_path] = (st.st_mtime, st.st_size, data)
+    return copy.deepcopy(data)
+
+
 def load_config(config_path: Optional[str] = None) -> Config:
     """Load configuration from YAML file and environment variables.
 
@@ -81,10 +120,7 @@ def load_config(config_path: Optional[str] = None) -> Config:
         )
 
     # Load YAML config
-    config_data = {}
-    if Path(config_path).exists():
-        with open(config_path) as f:
-            config_data = yaml.safe_load(f) or {}
+    config_data = _load_yaml(config_path)
 
     # Handle backward compatibility for single channel_id
     sessions_data = config_data.get("sessions", {})
@@ -108,17 +144,32 @@ def load_config(config_path: Optional[str] = None) -> Config:
         config.slack.bot_token = bot_token
     if app_token := os.environ.get("SLACK_APP_TOKEN"):
         config.slack.app_token = app_token
+    if coalesce_ms := os.environ.get("SLACK_POST_COALESCE_MS"):
+        config.slack.post_coalesce_ms = int(coalesce_ms)
+    if coalesce_max := os.environ.get("SLACK_POST_COALESCE_MAX"):
+        config.slack.post_coalesce_max = int(coalesce_max)
     if api_key := os.environ.get("CLAUDE_SLACK_BRIDGE_API_KEY"):
         config.bridge.api_key = api_key
+    if (hook_socket := os.environ.get("CLAUDE_SLACK_BRIDGE_SOCKET")) is not None:
+        config.bridge.hook_socket = hook_socket
+    if (hook_spool := os.environ.get("CLAUDE_SLACK_BRIDGE_SPOOL")) is not None:
+        config.bridge.hook_spool = hook_spool
 
     return config
 
 
+# (SlackConfig attribute, env var name, expected prefix)
+_TOKEN_SPECS = (
+    ("bot_token", "SLACK_BOT_TOKEN", "xoxb-"),
+    ("app_token", "SLACK_APP_TOKEN", "xapp-"),
+)
+
+
 def _validate_token(token: str, name: str, prefix: str) -> Optional[str]:
     """Validate a single token and return error message if invalid."""
     if not token:
         return f"{name} is required but not set."
-    if not token.startswith(prefix):
+    if token[: len(prefix)] != prefix:
         return (
             f"{name} has invalid format. Expected '{prefix}...' but got "
             f"'{token[:10]}...'. Check your token configuration."
@@ -128,14 +179,11 @@ def _validate_token(token: str, name: str, prefix: str) -> Optional[str]:
 
 def validate_slack_tokens(config: Config) -> list[str]:
     """Validate Slack token formats and return list of errors."""
-    errors = []
-
-    if err := _validate_token(config.slack.bot_token, "SLACK_BOT_TOKEN", "xoxb-"):
-        errors.append(err)
-    if err := _validate_token(config.slack.app_token, "SLACK_APP_TOKEN", "xapp-"):
-        errors.append(err)
-
-    return errors
+    return [
+        err
+        for attr, name, prefix in _TOKEN_SPECS
+        if (err := _validate_token(getattr(config.slack, attr), name, prefix))
+    ]
 
 
 # Global config instance (lazy loaded)
@@ -6,23 +6,60 @@ from typing import Any, Dict, List, Optional
 from .config import FormattingConfig
 from .models import FormattedOutput
 
+# ANSI escape code pattern. A single sub() stays in C and is ~3x faster
+# than a find()-based Python scan, even on escape-heavy terminal output.
+_ANSI_RE = re.compile(r"\x1b\[[0-9;]*m")
+
+# Code block pattern (markdown style)
+_CODE_BLOCK_RE = re.compile(r"```(\w*)\n(.*?)```", re.DOTALL)
+
+# Markdown -> Slack mrkdwn patterns, fused so conversion is a single scan:
+# headers (## Header), bold (**text**) and links ([text](url))
+_HEADER = r"^#{1,6}\s+(?P<header>.+)$"
+_BOLD = r"\*\*(?P<bold>.+?)\*\*"
+_LINK = r"\[(?P<text>[^\]]+)\]\((?P<url>[^)]+)\)"
+_MRKDWN_RE = re.compile(f"{_HEADER}|{_BOLD}|{_LINK}", re.MULTILINE)
+_INLINE_RE = re.compile(f"{_BOLD}|{_LINK}")
+_NL3_RE = re.compile(r"\n{3,}")
+
+# Whitespace (other than the newline itself) around each line break
+_LINE_TRIM_RE = re.compile(r"[^\S\n]*\n[^\S\n]*")
+
+# Fixed block shared by every truncated message (never mutated)
+_TRUNCATED_NOTICE_BLOCK: Dict[str, Any] = {
+    "type": "context",
+    "elements": [
+        {
+            "type": "mrkdwn",
+            "text": "_Output truncated..._",
+        }
+    ],
+}
+
+
+def _mrkdwn_replace(match: re.Match) -> str:
+    """Rewrite a single markdown construct matched by _MRKDWN_RE."""
+    kind = match.lastgroup
+    if kind == "header":
+        # Headers: ## Header -> *Header* (inline markup inside is converted too)
+        return f"*{_INLINE_RE.sub(_mrkdwn_replace, match.group('header'))}*"
+    if kind == "bold":
+        # Bold: **text** -> *text* (links inside are converted too)
+        return f"*{_INLINE_RE.sub(_mrkdwn_replace, match.group('bold'))}*"
+    # Links: [text](url) -> <url|text> (bold inside the text is converted too)
+    text = _INLINE_RE.sub(_mrkdwn_replace, match.group("text"))
+    return f"<{match.group('url')}|{text}>"
+
 
 class OutputFormatter:
     """Format Claude Code output for Slack."""
 
-    # ANSI escape code pattern
-    ANSI_PATTERN = re.compile(r"\x1b\[[0-9;]*m")
-
-    # Code block pattern (markdown style)
-    CODE_BLOCK_PATTERN = re.compile(r"```(\w*)\n(.*?)```", re.DOTALL)
+    ANSI_PATTERN = _ANSI_RE
+    CODE_BLOCK_PATTERN = _CODE_BLOCK_RE
 
     def __init__(self, config: FormattingConfig):
         """Initialize the formatter with configuration."""
-        self.mode = config.mode
-        self.max_length = config.max_length
-        self.long_output = config.long_output
-        self.strip_ansi = config.strip_ansi
-        self.preserve_code_blocks = config.preserve_code_blocks
+        self._cfg = config
 
     def format(self, content: str, event_type: str = "message") -> FormattedOutput:
         """Format content for Slack.
@@ -35,17 +72,17 @@ class OutputFormatter:
             FormattedOutput with text fallback and Slack blocks
         """
         # Strip ANSI codes if configured
-        if self.strip_ansi:
+        if self._cfg.strip_ansi:
             content = self._strip_ansi(content)
 
         # Apply mode-specific formatting
-        if self.mode == "code-only":
+        if self._cfg.mode == "code-only":
             content = self._extract_code_blocks(content)
-        elif self.mode == "compact":
+        elif self._cfg.mode == "compact":
             content = self._make_compact(content)
 
         # Handle long output
-        if len(content) > self.max_length:
+        if len(content) > self._cfg.max_length:
             content, is_truncated = self._handle_long_output(content)
         else:
             is_truncated = False
@@ -60,11 +97,13 @@ class OutputFormatter:
 
     def _strip_ansi(self, content: str) -> str:
         """Remove ANSI escape codes from content."""
-        return self.ANSI_PATTERN.sub("", content)
+        if "\x1b" not in content:
+            return content
+        return _ANSI_RE.sub("", content)
 
     def _extract_code_blocks(self, content: str) -> str:
         """Extract only code blocks from content."""
-        blocks = self.CODE_BLOCK_PATTERN.findall(content)
+        blocks = _CODE_BLOCK_RE.findall(content)
         if not blocks:
             # If no code blocks, look for inline code or return as-is
             return content
@@ -78,36 +117,31 @@ class OutputFormatter:
 
     def _make_compact(self, content: str) -> str:
         """Make content more compact for Slack display."""
-        # Remove excessive newlines
-        content = re.sub(r"\n{3,}", "\n\n", content)
-
-        # Remove leading/trailing whitespace from lines
-        lines = [line.strip() for line in content.split("\n")]
-        content = "\n".join(lines)
-
-        return content.strip()
+        # Remove excessive newlines, then leading/trailing whitespace from lines
+        content = _NL3_RE.sub("\n\n", content)
+        return _LINE_TRIM_RE.sub("\n", content).strip()
 
     def _handle_long_output(self, content: str) -> tuple[str, bool]:
         """Handle content that exceeds max length.
 
         Returns (processed_content, is_truncated)
         """
-        if self.long_output == "truncate":
+        if self._cfg.long_output == "truncate":
             # Truncate with ellipsis
-            truncated = content[: self.max_length - 50]
+            truncated = content[: self._cfg.max_length - 50]
             # Try to truncate at a newline
             last_newline = truncated.rfind("\n")
-            if last_newline > self.max_length - 200:
+            if last_newline > self._cfg.max_length - 200:
                 truncated = truncated[:last_newline]
             return truncated + "\n\n... (truncated)", True
 
-        elif self.long_output == "split":
+        elif self._cfg.long_output == "split":
             # Return first chunk (caller should handle splitting)
-            return content[: self.max_length - 50] + "\n\n... (continued)", True
+            return content[: self._cfg.max_length - 50] + "\n\n... (continued)", True
 
         else:  # file
             # Return truncated preview, full content will be uploaded as file
-            preview = content[: min(1000, self.max_length // 2)]
+            preview = content[: min(1000, self._cfg.max_length // 2)]
             return preview + "\n\n... (full output in file)", True
 
     def _build_blocks(
@@ -120,54 +154,42 @@ class OutputFormatter:
         content = self._convert_to_slack_mrkdwn(content)
 
         # Main content section
-        # Split into chunks if needed (Slack text block limit is 3000 chars)
+        # Split into chunks if needed (Slack text block limit is 3000 chars),
+        # slicing only the chunks that are kept (max 5 chunks in blocks)
         chunk_size = 2900
-        content_chunks = [
-            content[i : i + chunk_size] for i in range(0, len(content), chunk_size)
-        ]
-
-        for chunk in content_chunks[:5]:  # Max 5 chunks in blocks
+        for i in range(0, min(len(content), 5 * chunk_size), chunk_size):
             blocks.append(
                 {
                     "type": "section",
                     "text": {
                         "type": "mrkdwn",
-                        "text": chunk,
+                        "text": content[i : i + chunk_size],
                     },
                 }
             )
 
         # Add truncation notice if needed
         if is_truncated:
-            blocks.append(
-                {
-                    "type": "context",
-                    "elements": [
-                        {
-                            "type": "mrkdwn",
-                            "text": "_Output truncated..._",
-                        }
-                    ],
-                }
-            )
+            blocks.append(_TRUNCATED_NOTICE_BLOCK)
 
         return blocks
 
     def _convert_to_slack_mrkdwn(self, content: str) -> str:
         """Convert markdown to Slack mrkdwn format."""
-        # Headers: ## Header -> *Header*
-        content = re.sub(r'^#{1,6}\s+(.+)$', r'*\1*', content, flags=re.MULTILINE)
-
-        # Bold: **text** -> *text*
-        content = re.sub(r'\*\*(.+?)\*\*', r'*\1*', content)
+        # Nothing to rewrite: skip the regex passes entirely
+        if (
+            "#" not in content
+            and "**" not in content
+            and "[" not in content
+            and "\n\n\n" not in content
+        ):
+            return content.strip()
 
         # Italic: _text_ stays the same in Slack
-
-        # Links: [text](url) -> <url|text>
-        content = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'<\2|\1>', content)
+        content = _MRKDWN_RE.sub(_mrkdwn_replace, content)
 
         # Clean up excessive newlines
-        content = re.sub(r'\n{3,}', '\n\n', content)
+        content = _NL3_RE.sub("\n\n", content)
 
         return content.strip()
 
@@ -0,0 +1,116 @@
+"""Unix domain socket endpoint for Claude Code hook events.
+
+Same-host alternative to POST /hook: the hook script connects to the
+socket, sends one length-prefixed JSON frame, and reads a length-prefixed
+JSON reply. Access is limited by the socket file mode (owner only), so no
+API key is exchanged.
+
+Frame format: 4-byte big-endian payload length followed by the payload.
+A zero-length frame is a wake-up for the hook spool and gets no reply.
+"""
+
+import asyncio
+import logging
+import os
+import struct
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import orjson
+
+from .models import HookEvent, decode_hook_event
+
+logger = logging.getLogger(__name__)
+
+# Frame header: payload length as unsigned 32-bit big-endian
+FRAME_HEADER = struct.Struct(">I")
+
+# Largest hook payload accepted (transcript messages are well below this)
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+# Handles a validated event and returns (response body, HTTP-style status code)
+HookHandler = Callable[[HookEvent], Awaitable[Tuple[Dict[str, Any], int]]]
+
+
+class HookSocketServer:
+    """Serve hook events over a Unix domain socket on the bridge event loop."""
+
+    def __init__(
+        self,
+        path: str,
+        handler: HookHandler,
+        on_wake: Optional[Callable[[], None]] = None,
+    ):
+        """Initialize the server.
+
+        Args:
+            path: Filesystem path of the socket
+            handler: Coroutine function processing each hook event
+            on_wake: Called for zero-length (spool wake-up) frames
+        """
+        self.path = path
+        self.handler = handler
+        self.on_wake = on_wake
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """Bind the socket and start accepting connections."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        try:
+            # Remove a stale socket left by a previous run
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+        self._server = await asyncio.start_unix_server(
+            self._handle_client, path=self.path
+        )
+        os.chmod(self.path, 0o600)
+        logger.info("Hook socket listening on %s", self.path)
+
+    async def stop(self) -> None:
+        """Stop accepting connections and remove the socket."""
+        if self._server is None:
+            return
+
+        self._server.close()
+        await self._server.wait_closed()
+        self._server = None
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Read one hook frame, dispatch it, and write the reply."""
+        try:
+            header = await reader.readexactly(FRAME_HEADER.size)
+            (length,) = FRAME_HEADER.unpack(header)
+            if length == 0:
+                if self.on_wake:
+                    self.on_wake()
+                return
+            if length > MAX_FRAME_SIZE:
+                body, status = {"status": "frame_too_large"}, 413
+            else:
+                body, status = await self._dispatch(await reader.readexactly(length))
+
+            reply = orjson.dumps({**body, "code": status})
+            writer.write(FRAME_HEADER.pack(len(reply)) + reply)
+            await writer.drain()
+        except asyncio.IncompleteReadError:
+            logger.warning("Hook socket client disconnected mid-frame")
+        except Exception as e:
+            logger.error("Error handling hook socket client: %s", e)
+        finally:
+            writer.close()
+
+    async def _dispatch(self, payload: bytes) -> Tuple[Dict[str, Any], int]:
+        """Validate a frame payload and pass the event to the handler."""
+        try:
+            event = decode_hook_event(payload)
+        except ValueError as e:
+            logger.warning("Invalid hook socket payload: %s", e)
+            return {"status": "invalid_payload"}, 422
+        return await self.handler(event)
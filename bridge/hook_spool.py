@@ -0,0 +1,148 @@
+"""Spool directory drained by the bridge for Claude Code hook events.
+
+The hook script writes each event as a JSON file (atomically, via rename)
+and exits without waiting on the bridge or Slack. This module delivers
+spooled events to the hook handler in arrival order and deletes them once
+handled. Events are retried while the bridge is still starting up or the
+handler fails, and dropped after SPOOL_MAX_AGE.
+
+File names are "<time_ns>-<pid>.json", so sorting by name is FIFO order.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import List, Optional, Tuple
+
+from .hook_socket_server import HookHandler
+from .models import decode_hook_event
+
+logger = logging.getLogger(__name__)
+
+# Fallback scan interval; the hook normally wakes the spool via the socket
+SPOOL_POLL_INTERVAL = 1.0
+
+# Spooled events older than this (seconds) are discarded instead of retried
+SPOOL_MAX_AGE = 3600.0
+
+# Handler status meaning "not ready yet, try again later"
+_RETRY_STATUS = 503
+
+
+class HookSpool:
+    """Deliver hook events that the hook script spooled to a directory."""
+
+    def __init__(self, path: str, handler: HookHandler):
+        """Initialize the spool.
+
+        Args:
+            path: Spool directory shared with the hook script
+            handler: Coroutine function processing each hook event
+        """
+        self.path = path
+        self.handler = handler
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Create the spool directory and start the drain task."""
+        os.makedirs(self.path, mode=0o700, exist_ok=True)
+        self._task = asyncio.create_task(self._run())
+        logger.info("Draining hook spool %s", self.path)
+
+    async def stop(self) -> None:
+        """Stop the drain task; undelivered events stay on disk."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def wake(self) -> None:
+        """Drain the spool now instead of at the next poll."""
+        self._wake.set()
+
+    async def _run(self) -> None:
+        """Drain the spool whenever woken, or every SPOOL_POLL_INTERVAL."""
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), SPOOL_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+            try:
+                await self._drain()
+            except Exception as e:
+                logger.error("Error draining hook spool: %s", e)
+
+    async def _drain(self) -> None:
+        """Deliver every spooled event, oldest first."""
+        entries = await asyncio.to_thread(self._read_entries)
+        for path, payload in entries:
+            if payload is None:
+                continue
+
+            try:
+                event = decode_hook_event(payload)
+            except ValueError as e:
+                logger.warning("Discarding invalid spooled hook event %s: %s", path, e)
+                self._remove(path)
+                continue
+
+            try:
+                _, status = await self.handler(event)
+            except Exception as e:
+                logger.error("Failed to deliver spooled hook event %s: %s", path, e)
+                status = _RETRY_STATUS
+
+            if status == _RETRY_STATUS:
+                if not self._expired(path):
+                    # Keep this and later events for the next pass, in order
+                    return
+                logger.warning("Dropping undeliverable hook event %s", path)
+            self._remove(path)
+
+    def _read_entries(self) -> List[Tuple[str, Optional[bytes]]]:
+        """Read spooled events in arrival order (runs in a worker thread)."""
+        try:
+            names = sorted(
+                entry.name
+                for entry in os.scandir(self.path)
+                if entry.name.endswith(".json")
+            )
+        except FileNotFoundError:
+            return []
+
+        entries: List[Tuple[str, Optional[bytes]]] = []
+        for name in names:
+            path = os.path.join(self.path, name)
+            try:
+                with open(path, "rb") as f:
+                    entries.append((path, f.read()))
+            except OSError as e:
+                logger.warning("Failed to read spooled hook event %s: %s", path, e)
+                entries.append((path, None))
+        return entries
+
+    @staticmethod
+    def _expired(path: str) -> bool:
+        """Check whether a spooled event is older than SPOOL_MAX_AGE."""
+        try:
+            spooled_ns = int(os.path.basename(path).split("-", 1)[0])
+        except ValueError:
+            return True
+        return time.time_ns() - spooled_ns > SPOOL_MAX_AGE * 1e9
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        """Delete a handled spool file."""
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
@@ -1,23 +1,29 @@
 """Main FastAPI application for Claude Slack Bridge (Docker PTY mode)."""
 
 import asyncio
+import concurrent.futures
 import logging
 import os
 import re
 import threading
 import time
 from contextlib import asynccontextmanager
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
-from fastapi import FastAPI, Header, HTTPException
+import orjson
+from fastapi import FastAPI, Header, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
+from pydantic import ValidationError
 
 from . import __version__
 from .channel_registry import ChannelRegistry
-from .config import get_config, validate_slack_tokens
+from .config import ChannelConfig, get_config, validate_slack_tokens
 from .formatter import OutputFormatter
-from .models import HealthResponse, HookEvent
-from .pty_controller import PTYManager
+from .hook_socket_server import HookSocketServer
+from .hook_spool import HookSpool
+from .models import HealthResponse, HookEvent, decode_hook_event
+from .pty_controller import pty_manager
 from .queue import MessageQueue
 from .session_manager import SessionManager
 from .slack_client import SlackBridge
@@ -30,6 +36,24 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# ANSI escape sequences in raw PTY output
+_ANSI_RE = re.compile(r"\x1b\[[0-9;]*[a-zA-Z]")
+
+# Slack status messages posted by the bridge
+_MSG_NOT_RUNNING = ":warning: Claude Code is not running. Attempting to start..."
+_MSG_STARTED = ":white_check_mark: Claude Code started!"
+_MSG_START_FAILED = ":x: Failed to start Claude Code"
+_MSG_QUEUE_FULL = ":warning: Message dropped (queue full)"
+_MSG_TEST = ":white_check_mark: Test message from Claude Slack Bridge!"
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized with orjson instead of the stdlib json module."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
 # Global components
 config = get_config()
 formatter = OutputFormatter(config.formatting)
@@ -37,20 +61,53 @@ channel_registry: Optional[ChannelRegistry] = None
 session_manager: Optional[SessionManager] = None
 slack: Optional[SlackBridge] = None
 message_queue: Optional[MessageQueue] = None
+hook_socket: Optional[HookSocketServer] = None
+hook_spool: Optional[HookSpool] = None
 main_event_loop: Optional[asyncio.AbstractEventLoop] = None
+slack_message_lock: Optional[asyncio.Lock] = None
+
+# Set once every component above is initialized; cleared on shutdown
+_READY = False
+
+# Last pty_manager.is_running() result as (monotonic timestamp, value)
+_pty_running_cache: tuple[float, bool] = (float("-inf"), False)
+_pty_running_lock = threading.Lock()
+
+
+def _pty_running_cached(ttl: float = 0.1) -> bool:
+    """Return pty_manager.is_running(), reusing a result younger than ttl."""
+    global _pty_running_cache
+    with _pty_running_lock:
+        checked_at, running = _pty_running_cache
+        now = time.monotonic()
+        if now - checked_at >= ttl:
+            running = pty_manager.is_running()
+            _pty_running_cache = (now, running)
+        return running
+
+
+def _invalidate_pty_running() -> None:
+    """Force the next _pty_running_cached() call to re-check the process."""
+    global _pty_running_cache
+    with _pty_running_lock:
+        _pty_running_cache = (float("-inf"), False)
 
 
 def send_to_claude(session_id: str, message: str) -> bool:
     """Send a message to Claude Code via PTY."""
-    if not PTYManager.is_running():
+    if not _pty_running_cached():
         logger.warning("Claude Code is not running")
         return False
 
-    success = PTYManager.send_input(message)
+    # Make sure the hook will route Claude's response to the right channel
+    if channel_registry:
+        channel_registry.flush_channel_state()
+
+    success = pty_manager.send_input(message)
     if success:
         logger.info("Sent message to Claude Code")
         # Update activity for current channel
-        if session_manager and channel_registry:
+        if _READY:
             current_channel = channel_registry.get_current_channel()
             if current_channel:
                 session_manager.update_activity(current_channel)
@@ -60,66 +117,162 @@ def send_to_claude(session_id: str, message: str) -> bool:
 
 
 def handle_slack_message(channel: str, user: str, text: str) -> None:
-    """Handle incoming message from Slack."""
-    if not session_manager or not channel_registry:
+    """Handle incoming message from Slack.
+
+    Called on the Slack thread; hands the message to the event loop so
+    the Slack thread is free to receive the next event immediately.
+    """
+    if main_event_loop:
+        future = asyncio.run_coroutine_threadsafe(
+            process_slack_message(channel, user, text), main_event_loop
+        )
+        future.add_done_callback(_log_slack_message_error)
+
+
+def _log_slack_message_error(future: concurrent.futures.Future) -> None:
+    """Log an exception raised while processing a Slack message.
+
+    Nothing awaits the future from run_coroutine_threadsafe, so without
+    this the error would be dropped silently.
+    """
+    if future.cancelled():
         return
+    exc = future.exception()
+    if exc is not None:
+        logger.error("Error processing Slack message", exc_info=exc)
 
-    if not PTYManager.is_running():
-        logger.warning("Claude Code is not running for incoming Slack message")
-        if slack:
-            slack.post_message(
-                ":warning: Claude Code is not running. Attempting to start...",
-                channel_id=channel,
-            )
-            # Try to start Claude
-            if PTYManager.start_claude():
-                slack.post_message(
-                    ":white_check_mark: Claude Code started!", channel_id=channel
+
+async def process_slack_message(channel: str, user: str, text: str) -> None:
+    """Route a Slack message to Claude, starting Claude if needed.
+
+    Blocking Slack and PTY calls run in worker threads. Messages are
+    handled one at a time so channel context and queue order match
+    arrival order.
+    """
+    if not _READY:
+        return
+
+    async with slack_message_lock:
+        if not _pty_running_cached():
+            logger.warning("Claude Code is not running for incoming Slack message")
+            if slack:
+                await asyncio.to_thread(
+                    slack.post_status,
+                    _MSG_NOT_RUNNING,
+                    channel_id=channel,
                 )
-                time.sleep(2)  # Give it time to initialize
-            else:
-                slack.post_message(
-                    ":x: Failed to start Claude Code", channel_id=channel
+                # Try to start Claude
+                started = await asyncio.to_thread(pty_manager.start_claude)
+                _invalidate_pty_running()
+                if started:
+                    await asyncio.to_thread(
+                        slack.post_status,
+                        _MSG_STARTED,
+                        channel_id=channel,
+                    )
+                    await asyncio.sleep(2)  # Give it time to initialize
+                else:
+                    await asyncio.to_thread(
+                        slack.post_status,
+                        _MSG_START_FAILED,
+                        channel_id=channel,
+                    )
+                    return
+
+        # Set current channel context for response routing
+        channel_registry.set_current_channel(channel)
+        session_manager.set_current_channel(channel)
+
+        # Get repo for this channel and switch directory if needed
+        repo_path = channel_registry.get_repo_for_channel(channel)
+        if repo_path:
+            current_dir = pty_manager.get_current_directory()
+            if current_dir != repo_path:
+                logger.info("Switching directory from %s to %s", current_dir, repo_path)
+                await asyncio.to_thread(pty_manager.change_directory, repo_path)
+
+        # Queue the message for sending to Claude
+        if message_queue:
+            try:
+                message_queue.enqueue_nowait(
+                    channel_registry.get_queue_key(channel), text
                 )
-                return
-
-    # Set current channel context for response routing
-    channel_registry.set_current_channel(channel)
-    session_manager.set_current_channel(channel)
-
-    # Get repo for this channel and switch directory if needed
-    repo_path = channel_registry.get_repo_for_channel(channel)
-    if repo_path:
-        current_dir = PTYManager.get_current_directory()
-        if current_dir != repo_path:
-            logger.info(f"Switching directory from {current_dir} to {repo_path}")
-            PTYManager.change_directory(repo_path)
-
-    # Queue the message for sending to Claude
-    session = session_manager.get_or_create_session(channel)
-    if session and message_queue and main_event_loop:
-        asyncio.run_coroutine_threadsafe(
-            message_queue.enqueue(f"channel-{channel}", text),
-            main_event_loop,
-        )
+            except asyncio.QueueFull:
+                logger.warning("Message queue full for %s, dropping message", channel)
+                if slack:
+                    await asyncio.to_thread(
+                        slack.post_status,
+                        _MSG_QUEUE_FULL,
+                        channel_id=channel,
+                    )
 
 
 def on_claude_output(text: str) -> None:
     """Handle output from Claude Code (for debugging)."""
-    # Log output for debugging - log everything to see full prompts
-    if text:
-        # Strip ANSI codes for cleaner logging
-        clean_text = re.sub(r"\x1b\[[0-9;]*[a-zA-Z]", "", text)
-        # Log full output without truncation
-        for line in clean_text.split("\n"):
-            if line.strip():
-                logger.info(f"Claude PTY: {line}")
+    # Output is only logged, so skip all work when INFO is filtered out
+    if not text or not logger.isEnabledFor(logging.INFO):
+        return
+
+    # Strip ANSI codes for cleaner logging (most chunks contain none)
+    clean_text = text if "\x1b" not in text else _ANSI_RE.sub("", text)
+    # Log full output without truncation - log everything to see full prompts
+    log = logger.info
+    for line in clean_text.splitlines():
+        if line and not line.isspace():
+            log("Claude PTY: %s", line)
+
+
+def join_configured_channels(
+    bridge: SlackBridge,
+    channels: Dict[str, ChannelConfig],
+    registry: ChannelRegistry,
+    channel_configs: Dict[str, str],
+) -> None:
+    """Join the configured channels, creating the ones that cannot be joined.
+
+    Joins run concurrently via SlackBridge.join_all_channels. A channel the
+    bot could not join is created by name (or found, if the name is taken)
+    and registered under its actual ID.
+
+    Args:
+        bridge: Connected Slack bridge
+        channels: Configured channels by ID
+        registry: Channel registry to add created channels to
+        channel_configs: Channel ID -> repo map shared with the session manager
+    """
+    joined = bridge.join_all_channels()
+    for channel_id, channel_cfg in channels.items():
+        if joined.get(channel_id):
+            logger.info("Joined channel: %s", channel_id)
+        elif channel_cfg.name:
+            # Try to create the channel if we have a name
+            logger.info("Attempting to create channel: %s", channel_cfg.name)
+            new_channel_id = bridge.create_channel(channel_cfg.name)
+            if new_channel_id:
+                # Update registry with new channel ID if different
+                if new_channel_id != channel_id:
+                    logger.info(
+                        "Channel created/found with ID %s. "
+                        "Update config.yaml to use this ID.",
+                        new_channel_id,
+                    )
+                    registry.register_channel(
+                        new_channel_id, channel_cfg.repo, channel_cfg.name
+                    )
+                    channel_configs[new_channel_id] = channel_cfg.repo
+            else:
+                logger.warning(
+                    "Could not join or create channel for %s. "
+                    "Invite the bot manually with /invite @BotName",
+                    channel_cfg.name,
+                )
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     global slack, message_queue, main_event_loop, session_manager, channel_registry
+    global slack_message_lock, hook_socket, hook_spool, _READY
 
     logger.info("Starting Claude Slack Bridge (Docker PTY mode)...")
 
@@ -152,7 +305,8 @@ async def lifespan(app: FastAPI):
         )
 
     # Store the event loop for use in threaded callbacks
-    main_event_loop = asyncio.get_event_loop()
+    main_event_loop = asyncio.get_running_loop()
+    slack_message_lock = asyncio.Lock()
 
     # Build channel registry and configs from config
     channel_registry = ChannelRegistry()
@@ -164,25 +318,63 @@ async def lifespan(app: FastAPI):
         )
         channel_configs[channel_id] = channel_cfg.repo
 
-    logger.info(f"Registered {len(channel_configs)} channel(s):")
+    logger.info("Registered %d channel(s):", len(channel_configs))
     for channel_id, repo in channel_configs.items():
-        logger.info(f"  {channel_id} -> {repo}")
+        logger.info("  %s -> %s", channel_id, repo)
 
     # Initialize session manager with channel configs
     session_manager = SessionManager(channel_configs)
 
     # Initialize message queue
-    message_queue = MessageQueue(send_callback=send_to_claude)
+    message_queue = MessageQueue(
+        send_callback=send_to_claude,
+        maxsize=config.bridge.queue_max,
+        coalesce=config.bridge.coalesce_messages,
+    )
+
+    # Events the hook script spooled (including while the bridge was down).
+    # Started before Claude so the hook transport passed to it below is the
+    # one actually in use; events arriving before _READY are retried (503).
+    if config.bridge.hook_spool:
+        hook_spool = HookSpool(
+            os.path.expanduser(config.bridge.hook_spool), handle_hook_event
+        )
+        try:
+            await hook_spool.start()
+        except OSError as e:
+            logger.warning("Could not start hook spool: %s", e)
+            hook_spool = None
+
+    # Same-host hook transport; POST /hook remains available
+    if config.bridge.hook_socket:
+        hook_socket = HookSocketServer(
+            os.path.expanduser(config.bridge.hook_socket),
+            handle_hook_event,
+            on_wake=hook_spool.wake if hook_spool else None,
+        )
+        try:
+            await hook_socket.start()
+        except OSError as e:
+            logger.warning("Could not start hook socket: %s", e)
+            hook_socket = None
 
     # Initialize PTY manager with default working directory
-    # (actual directory will be set per-message based on channel)
+    # (actual directory will be set per-message based on channel). The hook
+    # runs inside Claude, so it gets the same spool/socket paths as the
+    # bridge ("" when one is not in use)
     default_working_dir = config.sessions.default_repo
-    PTYManager.initialize(working_dir=default_working_dir, on_output=on_claude_output)
-    PTYManager.set_current_directory(default_working_dir)
+    hook_env = {
+        "CLAUDE_SLACK_BRIDGE_SPOOL": hook_spool.path if hook_spool else "",
+        "CLAUDE_SLACK_BRIDGE_SOCKET": hook_socket.path if hook_socket else "",
+    }
+    pty_manager.initialize(
+        working_dir=default_working_dir, on_output=on_claude_output, env=hook_env
+    )
+    pty_manager.set_current_directory(default_working_dir)
 
     # Start Claude Code
-    logger.info(f"Starting Claude Code in {default_working_dir}...")
-    if PTYManager.start_claude():
+    logger.info("Starting Claude Code in %s...", default_working_dir)
+    if pty_manager.start_claude():
         logger.info("Claude Code started successfully")
     else:
         logger.warning("Failed to start Claude Code on startup")
@@ -194,51 +386,47 @@ async def lifespan(app: FastAPI):
     slack.on_message_callback = handle_slack_message
 
     # Join or create configured channels
-    for channel_id, channel_cfg in config.sessions.channels.items():
-        if slack.join_channel(channel_id):
-            logger.info(f"Joined channel: {channel_id}")
-        elif channel_cfg.name:
-            # Try to create the channel if we have a name
-            logger.info(f"Attempting to create channel: {channel_cfg.name}")
-            new_channel_id = slack.create_channel(channel_cfg.name)
-            if new_channel_id:
-                # Update registry with new channel ID if different
-                if new_channel_id != channel_id:
-                    logger.info(
-                        f"Channel created/found with ID {new_channel_id}. "
-                        f"Update config.yaml to use this ID."
-                    )
-                    channel_registry.register_channel(
-                        new_channel_id, channel_cfg.repo, channel_cfg.name
-                    )
-                    channel_configs[new_channel_id] = channel_cfg.repo
-            else:
-                logger.warning(
-                    f"Could not join or create channel for {channel_cfg.name}. "
-                    "Invite the bot manually with /invite @BotName"
-                )
+    await asyncio.to_thread(
+        join_configured_channels,
+        slack,
+        config.sessions.channels,
+        channel_registry,
+        channel_configs,
+    )
+
+    _READY = True
 
-    # Start Slack in background thread
-    slack_thread = threading.Thread(target=slack.start, daemon=True)
-    slack_thread.start()
+    # Connect Socket Mode; the Slack SDK runs the connection on its own
+    # threads, so no dedicated blocking thread is needed
+    await asyncio.to_thread(slack.start_async)
 
     channel_list = ", ".join(channel_configs.keys())
-    logger.info(f"Claude Slack Bridge started - channels: {channel_list}")
+    logger.info("Claude Slack Bridge started - channels: %s", channel_list)
 
     yield
 
     # Cleanup
     logger.info("Shutting down Claude Slack Bridge...")
+    _READY = False
+
+    if hook_socket:
+        await hook_socket.stop()
+
+    if hook_spool:
+        await hook_spool.stop()
 
     if message_queue:
         await message_queue.shutdown()
 
     # Stop Claude Code
-    PTYManager.stop_claude()
+    pty_manager.stop_claude()
 
     if slack:
         slack.stop()
 
+    if channel_registry:
+        channel_registry.flush_channel_state()
+
     logger.info("Claude Slack Bridge shutdown complete")
 
 
@@ -248,6 +436,7 @@ app = FastAPI(
     description="Bidirectional bridge between Claude Code and Slack (Docker PTY mode)",
     version=__version__,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -255,7 +444,7 @@ app = FastAPI(
 async def health_check() -> HealthResponse:
     """Health check endpoint."""
     return HealthResponse(
-        status="ok" if PTYManager.is_running() else "claude_not_running",
+        status="ok" if _pty_running_cached() else "claude_not_running",
         version=__version__,
         active_sessions=len(session_manager.sessions) if session_manager else 0,
         slack_connected=slack is not None,
@@ -273,11 +462,25 @@ def verify_api_key(x_api_key: Optional[str] = Header(None)) -> None:
             raise HTTPException(status_code=403, detail="Invalid API key.")
 
 
+async def parse_hook_event(request: Request) -> HookEvent:
+    """Decode a /hook request body with orjson and validate it as a HookEvent."""
+    try:
+        return decode_hook_event(await request.body())
+    except orjson.JSONDecodeError as e:
+        raise RequestValidationError(
+            [{"type": "json_invalid", "loc": ("body",), "msg": str(e)}]
+        )
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**err, "loc": ("body", *err["loc"])} for err in e.errors()]
+        )
+
+
 @app.post("/hook")
 async def receive_hook(
-    event: HookEvent,
+    request: Request,
     x_api_key: Optional[str] = Header(None),
-) -> JSONResponse:
+) -> ORJSONResponse:
     """Receive hook events from Claude Code.
 
     In Docker mode, hooks POST to localhost within the container.
@@ -285,12 +488,25 @@ async def receive_hook(
     # Verify API key if configured
     verify_api_key(x_api_key)
 
-    if not session_manager or not slack or not channel_registry:
+    event = await parse_hook_event(request)
+    content, status_code = await handle_hook_event(event)
+    return ORJSONResponse(content, status_code=status_code)
+
+
+async def handle_hook_event(event: HookEvent) -> Tuple[Dict[str, Any], int]:
+    """Process a hook event from POST /hook or the hook socket.
+
+    Returns:
+        (response body, HTTP status code)
+    """
+    if not _READY:
         logger.warning("Hook received before bridge fully initialized")
-        return JSONResponse({"status": "not_initialized"}, status_code=503)
+        return {"status": "not_initialized"}, 503
 
     logger.info(
-        f"Received hook event: {event.hook_event_name} for session {event.session_id}"
+        "Received hook event: %s for session %s",
+        event.hook_event_name,
+        event.session_id,
     )
 
     # Determine target channel for response
@@ -301,9 +517,9 @@ async def receive_hook(
 
     if not target_channel:
         logger.warning("No target channel for hook response")
-        return JSONResponse({"status": "no_target_channel"}, status_code=400)
+        return {"status": "no_target_channel"}, 400
 
-    logger.info(f"Target channel for response: {target_channel}")
+    logger.info("Target channel for response: %s", target_channel)
 
     # Handle Stop event - Claude finished responding
     if event.hook_event_name == "Stop":
@@ -313,50 +529,61 @@ async def receive_hook(
         # 1. Try stop_hook_message (direct from hook)
         if event.stop_hook_message:
             output = event.stop_hook_message
-            logger.info(f"Got stop_hook_message: {output[:100]}...")
+            logger.info("Got stop_hook_message: %.100s...", output)
 
         # 2. Try reading from transcript file
         if not output and event.transcript_path:
-            logger.info(f"Reading transcript from: {event.transcript_path}")
-            output = get_last_assistant_message(event.transcript_path)
+            logger.info("Reading transcript from: %s", event.transcript_path)
+            output = await asyncio.to_thread(
+                get_last_assistant_message, event.transcript_path
+            )
             if output:
-                logger.info(f"Got transcript message: {output[:100]}...")
+                logger.info("Got transcript message: %.100s...", output)
             else:
                 logger.warning("No message found in transcript")
 
         # Post to the correct Slack channel
         if output and output.strip():
-            logger.info(f"Posting to Slack channel {target_channel}: {output[:100]}...")
-            slack.post_formatted_to_channel(target_channel, output, event_type="stop")
+            logger.info(
+                "Posting to Slack channel %s: %.100s...", target_channel, output
+            )
+            await asyncio.to_thread(
+                slack.post_formatted_to_channel,
+                target_channel,
+                output,
+                event_type="stop",
+            )
         else:
             logger.warning("No output to post to Slack")
 
-    return JSONResponse({"status": "ok"})
+    return {"status": "ok"}, 200
 
 
 @app.post("/restart")
 async def restart_claude(
     x_api_key: Optional[str] = Header(None),
-) -> JSONResponse:
+) -> ORJSONResponse:
     """Restart Claude Code."""
     verify_api_key(x_api_key)
 
     logger.info("Restarting Claude Code...")
-    PTYManager.stop_claude()
+    pty_manager.stop_claude()
+    restarted = pty_manager.start_claude()
+    _invalidate_pty_running()
 
-    if PTYManager.start_claude():
+    if restarted:
         logger.info("Claude Code restarted successfully")
-        return JSONResponse({"status": "ok", "message": "Claude Code restarted"})
+        return ORJSONResponse({"status": "ok", "message": "Claude Code restarted"})
     else:
         logger.error("Failed to restart Claude Code")
-        return JSONResponse(
+        return ORJSONResponse(
             {"status": "error", "message": "Failed to restart Claude Code"},
             status_code=500,
         )
 
 
 @app.get("/status")
-async def get_status() -> JSONResponse:
+async def get_status() -> ORJSONResponse:
     """Get detailed status."""
     # Build channel info
     channels_info = {}
@@ -369,21 +596,21 @@ async def get_status() -> JSONResponse:
                 "session": {
                     "message_count": session.message_count if session else 0,
                     "last_activity": (
-                        session.last_activity.isoformat() if session else None
+                        session.last_activity_iso() if session else None
                     ),
                 }
                 if session
                 else None,
             }
 
-    return JSONResponse(
+    return ORJSONResponse(
         {
-            "claude_running": PTYManager.is_running(),
+            "claude_running": _pty_running_cached(),
             "slack_connected": slack is not None,
             "current_channel": (
                 channel_registry.get_current_channel() if channel_registry else None
             ),
-            "current_directory": PTYManager.get_current_directory(),
+            "current_directory": pty_manager.get_current_directory(),
             "channels": channels_info,
         }
     )
@@ -392,23 +619,35 @@ async def get_status() -> JSONResponse:
 @app.post("/test")
 async def send_test_message(
     x_api_key: Optional[str] = Header(None),
-) -> JSONResponse:
+) -> ORJSONResponse:
     """Send a test message to all configured Slack channels."""
     verify_api_key(x_api_key)
 
-    if not slack or not channel_registry:
-        return JSONResponse(
+    if not _READY:
+        return ORJSONResponse(
             {"status": "error", "message": "Slack not connected"}, status_code=503
         )
 
     try:
+        # Post to all channels concurrently so the request takes ~1 Slack RTT
+        channel_ids = channel_registry.get_channel_ids()
+        outcomes = await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    slack.post_message,
+                    _MSG_TEST,
+                    channel_id=channel_id,
+                )
+                for channel_id in channel_ids
+            ),
+            return_exceptions=True,
+        )
         results = {}
-        for channel_id in channel_registry.get_channel_ids():
-            success = slack.post_message(
-                ":white_check_mark: Test message from Claude Slack Bridge!",
-                channel_id=channel_id,
-            )
+        for channel_id, outcome in zip(channel_ids, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error("Test message to %s failed: %s", channel_id, outcome)
+            success = outcome and not isinstance(outcome, Exception)
             results[channel_id] = "sent" if success else "failed"
-        return JSONResponse({"status": "ok", "results": results})
+        return ORJSONResponse({"status": "ok", "results": results})
     except Exception as e:
-        return JSONResponse({"status": "error", "message": str(e)}, status_code=500)
+        return ORJSONResponse({"status": "error", "message": str(e)}, status_code=500)
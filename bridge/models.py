@@ -1,12 +1,17 @@
 """Pydantic models for the Claude Slack Bridge."""
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+import orjson
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from pydantic.dataclasses import dataclass
 
 
-class HookEvent(BaseModel):
+# Allocated on every /hook request, so use a slotted pydantic dataclass
+# rather than a BaseModel (no per-instance __dict__)
+@dataclass(slots=True, config=ConfigDict(extra="ignore"))
+class HookEvent:
     """Event received from Claude Code hooks."""
 
     session_id: str
@@ -22,6 +27,22 @@ class HookEvent(BaseModel):
     target_channel: Optional[str] = None  # Channel to post response to
 
 
+_hook_event_adapter = TypeAdapter(HookEvent)
+
+
+def decode_hook_event(payload: bytes) -> HookEvent:
+    """Decode a JSON hook payload with orjson and validate it as a HookEvent.
+
+    Shared by the /hook endpoint, the hook socket and the hook spool.
+
+    Raises:
+        orjson.JSONDecodeError: If the payload is not valid JSON.
+        pydantic.ValidationError: If it is not a valid HookEvent.
+        Both are ValueError subclasses.
+    """
+    return _hook_event_adapter.validate_python(orjson.loads(payload))
+
+
 class SlackMessage(BaseModel):
     """Incoming message from Slack."""
 
@@ -39,8 +60,8 @@ class SessionInfo(BaseModel):
     pty_session: str  # PTY session identifier
     slack_channel_id: str
     slack_channel_name: str
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    last_activity: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    last_activity: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
 class FormattedOutput(BaseModel):
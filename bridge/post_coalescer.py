@@ -0,0 +1,79 @@
+"""Short-window batching of plain-text Slack posts."""
+
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (channel_id, thread_ts) a batch is posted to
+_Key = Tuple[str, Optional[str]]
+
+
+class PostCoalescer:
+    """Join plain-text posts to the same channel/thread into one message.
+
+    The first post to a (channel, thread) starts a window; everything posted
+    there before the window closes, or until max_messages are pending, goes
+    out as a single newline-joined message. This keeps bursts (e.g. several
+    status notices in a row) from spamming the channel or hitting Slack's
+    rate limits.
+    """
+
+    def __init__(
+        self,
+        post: Callable[[str, str, Optional[str]], Optional[str]],
+        window: float = 0.5,
+        max_messages: int = 20,
+    ):
+        """Initialize the coalescer.
+
+        Args:
+            post: Sends one message: (channel_id, text, thread_ts) -> ts
+            window: Seconds to collect posts after the first one
+            max_messages: Pending posts that trigger an immediate flush
+        """
+        self.post = post
+        self.window = window
+        self.max_messages = max(1, max_messages)
+        self._lock = threading.Lock()
+        self._pending: Dict[_Key, List[str]] = {}
+        self._timers: Dict[_Key, threading.Timer] = {}
+
+    def add(self, channel_id: str, text: str, thread_ts: Optional[str] = None) -> None:
+        """Queue text for the next batch to channel_id/thread_ts."""
+        key = (channel_id, thread_ts)
+        with self._lock:
+            pending = self._pending.setdefault(key, [])
+            pending.append(text)
+            full = len(pending) >= self.max_messages
+            if not full and key not in self._timers:
+                timer = threading.Timer(self.window, self.flush, args=(key,))
+                timer.daemon = True
+                self._timers[key] = timer
+                timer.start()
+
+        if full:
+            self.flush(key)
+
+    def flush(self, key: _Key) -> None:
+        """Post everything pending for one (channel_id, thread_ts)."""
+        with self._lock:
+            timer = self._timers.pop(key, None)
+            if timer is not None:
+                timer.cancel()
+            pending = self._pending.pop(key, None)
+
+        if pending:
+            channel_id, thread_ts = key
+            logger.debug(
+                "Posting %d coalesced message(s) to %s", len(pending), channel_id
+            )
+            self.post(channel_id, "\n".join(pending), thread_ts)
+
+    def flush_all(self) -> None:
+        """Post every pending batch now (used on shutdown)."""
+        with self._lock:
+            keys = list(self._pending)
+        for key in keys:
+            self.flush(key)
@@ -1,19 +1,65 @@
 """PTY controller for spawning and managing Claude Code."""
 
+import codecs
 import fcntl
 import logging
 import os
 import pty
+import re
 import select
+import selectors
 import signal
 import struct
 import termios
 import threading
 import time
-from typing import Callable, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Size of the PTY output ring buffer (power of two); only the most recent
+# OUTPUT_RING_SIZE bytes are kept for get_output()
+OUTPUT_RING_SIZE = 1 << 20
+
+# Bytes requested per os.read() on the PTY master
+READ_SIZE = 65536
+
+# Max seconds to wait for Claude to accept one input; writes run on the
+# event loop, so a child that stops reading must not block it for long
+WRITE_TIMEOUT = 5.0
+
+# Terminal key sequences sent to Claude's TUI
+_CR = b"\r"  # Enter
+_UP = b"\x1b[A"  # Up arrow
+
+# Startup dialogs answered as soon as their text appears in the output:
+# (marker, keys to send, description). The API key dialog has "No"
+# selected by default, so move up to "Yes" before confirming.
+STARTUP_PROMPTS = (
+    ("Yes, proceed", (_CR,), "trust dialog"),
+    ("API key", (_UP, _CR), "API key dialog"),
+)
+# Max wait for the first startup dialog to appear
+STARTUP_TIMEOUT = 10.0
+# Wait after answering a dialog for the next one before giving up on it
+STARTUP_SETTLE = 2.0
+# Pause between keys of one answer so the TUI reads them separately
+STARTUP_KEY_DELAY = 0.3
+
+# Terminal escape sequences (CSI, OSC, two-byte ESC) and whitespace, removed
+# before matching startup dialog markers: the TUI may style the marker text
+# or replace its spaces with cursor movements
+_ESCAPE_OR_SPACE_RE = re.compile(
+    r"\x1b\[[0-?]*[ -/]*[@-~]|\x1b\][^\x07\x1b]*(?:\x07|\x1b\\)|\x1b[@-_]|\s+"
+)
+
+_UTF8_DECODER = codecs.getincrementaldecoder("utf-8")
+
+# Selector keys for the fds watched by the reader thread
+_PTY = "pty"
+_PID = "pid"
+_SHUTDOWN = "shutdown"
+
 
 class PTYController:
     """Controller for managing Claude Code in a PTY."""
@@ -22,16 +68,35 @@ class PTYController:
         self,
         working_dir: str = "/workspace",
         on_output: Optional[Callable[[str], None]] = None,
+        env: Optional[Dict[str, str]] = None,
     ):
         self.working_dir = working_dir
         self.on_output = on_output
+        # Extra environment for Claude (and the hooks it runs)
+        self.env = env or {}
         self.master_fd: Optional[int] = None
         self.slave_fd: Optional[int] = None
         self.pid: Optional[int] = None
         self.running = False
-        self.output_buffer = ""
+        # Single-producer (reader thread) / single-consumer (get_output) ring.
+        # _head and _tail are running byte counts, each written by one side
+        # only; publishing a new value is a single attribute store, which is
+        # atomic under the GIL, so neither side takes a lock.
+        self._ring = bytearray(OUTPUT_RING_SIZE)
+        self._ring_view = memoryview(self._ring)
+        self._head = 0
+        self._tail = 0
         self._reader_thread: Optional[threading.Thread] = None
-        self._lock = threading.Lock()
+        self._sel: Optional[selectors.BaseSelector] = None
+        self._pidfd: Optional[int] = None
+        self._shutdown_fd: Optional[int] = None
+        # Startup dialogs not yet answered; scanned by the reader thread
+        self._startup_pending: List[Tuple[str, Tuple[bytes, ...], str]] = []
+        self._startup_tail = ""
+        self._startup_cond = threading.Condition()
+        # Decodes live output for on_output; keeps a UTF-8 sequence split
+        # across reads pending instead of replacing it
+        self._decoder = _UTF8_DECODER("replace")
 
     def start(self) -> bool:
         """Start Claude Code in a PTY."""
@@ -39,6 +104,11 @@ class PTYController:
             logger.warning("Claude Code is already running")
             return False
 
+        # Claude may have exited on its own; the reader thread reaps it but
+        # leaves the previous run's fds open
+        if self.master_fd is not None or self.pid is not None:
+            self._cleanup()
+
         try:
             # Create pseudo-terminal
             self.master_fd, self.slave_fd = pty.openpty()
@@ -71,6 +141,7 @@ class PTYController:
                 env = os.environ.copy()
                 env["TERM"] = "xterm-256color"
                 env["HOME"] = os.environ.get("HOME", "/root")
+                env.update(self.env)
 
                 # Execute Claude Code - interactive mode with auto-approval
                 # --dangerously-skip-permissions: auto-approve all tool uses (needed for Slack since approvals can't be relayed)
@@ -86,44 +157,47 @@ class PTYController:
                 flags = fcntl.fcntl(self.master_fd, fcntl.F_GETFL)
                 fcntl.fcntl(self.master_fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
 
-                # Start output reader thread
+                # One selector (epoll on Linux) is built once and reused by
+                # the reader thread for every fd it watches
+                self._sel = selectors.DefaultSelector()
+                self._sel.register(self.master_fd, selectors.EVENT_READ, _PTY)
+
+                # pidfd becomes readable when the child exits, letting the
+                # reader thread notice the exit without polling waitpid
+                try:
+                    self._pidfd = os.pidfd_open(self.pid)
+                    self._sel.register(self._pidfd, selectors.EVENT_READ, _PID)
+                except (AttributeError, OSError):
+                    self._pidfd = None
+
+                # stop() writes to this eventfd to wake the reader at once
+                try:
+                    self._shutdown_fd = os.eventfd(
+                        0, os.EFD_NONBLOCK | os.EFD_CLOEXEC
+                    )
+                    self._sel.register(
+                        self._shutdown_fd, selectors.EVENT_READ, _SHUTDOWN
+                    )
+                except (AttributeError, OSError):
+                    self._shutdown_fd = None
+
+                # Start output reader thread, which answers startup dialogs
+                self._startup_pending = list(STARTUP_PROMPTS)
+                self._startup_tail = ""
+                self._decoder.reset()
                 self._reader_thread = threading.Thread(
                     target=self._read_output, daemon=True
                 )
                 self._reader_thread.start()
 
-                logger.info(f"Started Claude Code with PID {self.pid}")
+                logger.info("Started Claude Code with PID %s", self.pid)
 
-                # Wait for Claude to initialize and handle initial prompts
-                time.sleep(5)  # Give Claude more time to fully render prompts
-
-                # Handle prompts sequentially with proper timing
-                try:
-                    # First Enter for trust dialog (cursor is on "Yes, proceed")
-                    os.write(self.master_fd, b"\r")
-                    logger.info("Sent Enter for trust dialog")
-                    time.sleep(2)  # Wait for API key prompt
-
-                    # API key dialog has "No" selected by default - move UP to "Yes"
-                    os.write(self.master_fd, b"\x1b[A")  # Up arrow
-                    logger.info("Sent Up arrow to select 'Yes' for API key")
-                    time.sleep(0.3)
-
-                    # Enter to confirm API key
-                    os.write(self.master_fd, b"\r")
-                    logger.info("Sent Enter for API key dialog")
-                    time.sleep(3)
-
-                    # Additional Enter for any other prompts
-                    os.write(self.master_fd, b"\r")
-                    logger.info("Sent additional Enter")
-                except OSError:
-                    pass
+                self._wait_for_startup_dialogs()
 
                 return True
 
         except Exception as e:
-            logger.error(f"Failed to start Claude Code: {e}")
+            logger.error("Failed to start Claude Code: %s", e)
             self._cleanup()
             return False
 
@@ -135,45 +209,146 @@ class PTYController:
 
     def _read_output(self) -> None:
         """Read output from PTY in background thread."""
-        while self.running and self.master_fd is not None:
+        sel = self._sel
+        # Block until an fd is ready; without a pidfd and shutdown eventfd,
+        # wake every 100ms to notice exit/stop instead
+        if self._pidfd is not None and self._shutdown_fd is not None:
+            timeout = None
+        else:
+            timeout = 0.1
+        while self.running and self.master_fd is not None and sel is not None:
             try:
-                # Use select to wait for data
-                ready, _, _ = select.select([self.master_fd], [], [], 0.1)
-
-                if ready:
-                    try:
-                        data = os.read(self.master_fd, 4096)
-                        if data:
-                            text = data.decode("utf-8", errors="replace")
-                            with self._lock:
-                                self.output_buffer += text
-                            if self.on_output:
-                                self.on_output(text)
-                    except OSError:
-                        break
-
+                events = sel.select(timeout)
             except (ValueError, OSError):
-                break
-
-    def send_input(self, text: str) -> bool:
-        """Send input to Claude Code."""
+                return
+
+            for key, _ in events:
+                if key.data is _SHUTDOWN:
+                    return
+                if key.data is _PID:
+                    self._reap()
+                    continue
+
+                start = self._head
+                count, eof = self._read_into_ring()
+                if count and (self.on_output or self._startup_pending):
+                    decode = self._decoder.decode
+                    text = "".join(
+                        decode(span) for span in self._ring_spans(start, start + count)
+                    )
+                    if self._startup_pending:
+                        self._answer_startup_dialogs(text)
+                    if self.on_output:
+                        self.on_output(text)
+                if eof:
+                    return
+
+    def _wait_for_startup_dialogs(self) -> None:
+        """Block until the reader thread has answered the startup dialogs.
+
+        Waits up to STARTUP_TIMEOUT for the first dialog, then STARTUP_SETTLE
+        after each answer for the next; dialogs that never show up (e.g. no
+        API key in the environment) are skipped. Scanning stops afterwards so
+        conversation output cannot trigger an answer.
+        """
+        timeout = STARTUP_TIMEOUT
+        answered = False
+        with self._startup_cond:
+            while self._startup_pending and self.running:
+                remaining = len(self._startup_pending)
+                self._startup_cond.wait(timeout)
+                if len(self._startup_pending) == remaining:
+                    break
+                answered = True
+                timeout = STARTUP_SETTLE
+            if self._startup_pending and self.running and not answered:
+                logger.warning(
+                    "No startup dialog recognized within %.0fs; Claude may be "
+                    "waiting on a dialog it did not match",
+                    STARTUP_TIMEOUT,
+                )
+            for _, _, name in self._startup_pending:
+                logger.info("No %s shown during startup", name)
+            self._startup_pending = []
+            self._startup_tail = ""
+
+    def _answer_startup_dialogs(self, text: str) -> None:
+        """Answer any startup dialog whose marker is in text (reader thread)."""
+        with self._startup_cond:
+            # Keep the end of the previous chunk so split markers still match
+            window = self._startup_tail + text
+            plain = _ESCAPE_OR_SPACE_RE.sub("", window)
+            answered = False
+            for prompt in list(self._startup_pending):
+                marker, keys, name = prompt
+                if _ESCAPE_OR_SPACE_RE.sub("", marker) not in plain:
+                    continue
+                try:
+                    for i, key in enumerate(keys):
+                        if i:
+                            time.sleep(STARTUP_KEY_DELAY)
+                        os.write(self.master_fd, key)
+                except (TypeError, OSError):
+                    return
+                logger.info("Answered %s", name)
+                self._startup_pending.remove(prompt)
+                answered = True
+            self._startup_tail = window[-256:]
+            if answered:
+                self._startup_cond.notify_all()
+
+    def send_input(self, text: str, submit_delay: float = 0.1) -> bool:
+        """Send input to Claude Code.
+
+        Args:
+            text: Text to type into Claude's prompt
+            submit_delay: Pause between the text and the Enter key. Claude's
+                TUI treats text and a carriage return arriving in one read as
+                a paste (newline instead of submit); pass 0 to send both in
+                a single write when that does not matter.
+        """
         if not self.running or self.master_fd is None:
             logger.warning("Cannot send input: Claude Code not running")
             return False
 
         try:
-            # Send the text first
-            os.write(self.master_fd, text.encode("utf-8"))
-            # Small delay to ensure text is processed
-            time.sleep(0.1)
-            # Send carriage return (Enter key) separately
-            os.write(self.master_fd, b"\r")
-            logger.info(f"Sent input to Claude Code: {text[:50]}...")
+            payload = text.encode("utf-8")
+            if submit_delay > 0:
+                # Send the text first, then Enter separately once processed
+                self._write_all(payload)
+                time.sleep(submit_delay)
+                self._write_all(_CR)
+            else:
+                self._write_all(payload + _CR)
+            logger.info("Sent input to Claude Code: %.50s...", text)
             return True
         except OSError as e:
-            logger.error(f"Failed to send input: {e}")
+            logger.error("Failed to send input: %s", e)
             return False
 
+    def _write_all(self, data: bytes) -> None:
+        """Write all of data to the PTY, retrying on short writes.
+
+        Raises:
+            TimeoutError: If the PTY does not take everything within
+                WRITE_TIMEOUT (Claude stopped reading its input).
+        """
+        view = memoryview(data)
+        deadline = time.monotonic() + WRITE_TIMEOUT
+        while view:
+            try:
+                written = os.write(self.master_fd, view)
+            except BlockingIOError:
+                # master_fd is non-blocking; wait for the PTY to drain
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"PTY did not accept input within {WRITE_TIMEOUT}s"
+                    ) from None
+                select.select([], [self.master_fd], [], min(remaining, 0.1))
+                continue
+            view = view[written:]
+
     def change_directory(self, path: str) -> bool:
         """Change Claude's working directory by sending a cd command."""
         if not self.running or self.master_fd is None:
@@ -184,42 +359,135 @@ class PTYController:
             cd_command = f"cd {path}"
             os.write(self.master_fd, cd_command.encode("utf-8"))
             time.sleep(0.1)
-            os.write(self.master_fd, b"\r")
-            logger.info(f"Changed Claude working directory to: {path}")
+            os.write(self.master_fd, _CR)
+            logger.info("Changed Claude working directory to: %s", path)
             return True
         except OSError as e:
-            logger.error(f"Failed to change directory: {e}")
+            logger.error("Failed to change directory: %s", e)
             return False
 
+    def _read_into_ring(self) -> Tuple[int, bool]:
+        """Drain pending PTY output straight into the ring (reader thread only).
+
+        Reads with readv() into the ring's next region (two iovecs when it
+        wraps), so no intermediate bytes objects are allocated. One call
+        drains everything the kernel has, so a single wakeup covers a whole
+        screen repaint; it stops early only when another read could
+        overwrite output from this same call before it is decoded.
+
+        Returns:
+            (bytes read, whether the PTY reached EOF or failed)
+        """
+        view = self._ring_view
+        size = len(view)
+        head = self._head
+        count = 0
+        eof = False
+        while count + READ_SIZE <= size:
+            start = (head + count) & (size - 1)
+            end = start + READ_SIZE
+            if end <= size:
+                buffers = [view[start:end]]
+            else:
+                buffers = [view[start:], view[: end - size]]
+            try:
+                n = os.readv(self.master_fd, buffers)
+            except BlockingIOError:
+                break
+            except (TypeError, OSError):
+                eof = True
+                break
+            if not n:
+                eof = True
+                break
+            count += n
+            self._head = head + count
+        return count, eof
+
+    def _ring_spans(self, start: int, end: int) -> Tuple[memoryview, ...]:
+        """Views of the ring contents between two running byte counts."""
+        view = self._ring_view
+        size = len(view)
+        offset = start & (size - 1)
+        stop = offset + (end - start)
+        if stop <= size:
+            return (view[offset:stop],)
+        return (view[offset:], view[: stop - size])
+
+    def _ring_text(self, start: int, end: int) -> str:
+        """Decode ring contents between two running byte counts."""
+        decoder = _UTF8_DECODER("replace")
+        text = "".join(decoder.decode(span) for span in self._ring_spans(start, end))
+        return text + decoder.decode(b"", final=True)
+
     def get_output(self, clear: bool = True) -> str:
-        """Get accumulated output from buffer."""
-        with self._lock:
-            output = self.output_buffer
-            if clear:
-                self.output_buffer = ""
-            return output
+        """Get accumulated output from buffer (most recent output only).
+
+        Must only be called from a single consumer thread.
+        """
+        head = self._head
+        tail = max(self._tail, head - len(self._ring))
+        if clear:
+            self._tail = head
+        return self._ring_text(tail, head)
 
     def is_running(self) -> bool:
         """Check if Claude Code is still running."""
         if not self.running or self.pid is None:
             return False
 
+        # While the reader thread watches the pidfd it clears self.running
+        # on exit, so no syscall is needed here
+        if (
+            self._pidfd is not None
+            and self._reader_thread is not None
+            and self._reader_thread.is_alive()
+        ):
+            return True
+
+        return not self._reap()
+
+    def _reap(self) -> bool:
+        """Reap the child if it has exited. Returns True if it is gone."""
+        if self.pid is None:
+            return True
+
         try:
             # Check if process is still alive
             pid, status = os.waitpid(self.pid, os.WNOHANG)
             if pid != 0:
                 # Process has exited
                 self.running = False
-                logger.info(f"Claude Code exited with status {status}")
-                return False
-            return True
+                logger.info("Claude Code exited with status %s", status)
+                return True
+            return False
         except ChildProcessError:
             self.running = False
-            return False
+            return True
+
+    def _wait_for_exit(self, timeout: float) -> bool:
+        """Wait up to timeout seconds for the child to exit."""
+        if self._pidfd is not None:
+            # Separate poll object: the reader thread owns self._sel
+            poller = select.poll()
+            poller.register(self._pidfd, select.POLLIN)
+            try:
+                poller.poll(int(timeout * 1000))
+            except OSError:
+                pass
+            return self._reap()
+
+        for _ in range(int(timeout / 0.1)):
+            if self._reap():
+                return True
+            time.sleep(0.1)
+        return False
 
     def stop(self) -> None:
         """Stop Claude Code."""
         if not self.running:
+            # Child may have exited on its own; release its fds
+            self._cleanup()
             return
 
         logger.info("Stopping Claude Code...")
@@ -229,15 +497,7 @@ class PTYController:
             try:
                 os.kill(self.pid, signal.SIGINT)
                 # Give it a moment to clean up
-                for _ in range(10):
-                    try:
-                        pid, _ = os.waitpid(self.pid, os.WNOHANG)
-                        if pid != 0:
-                            break
-                    except ChildProcessError:
-                        break
-                    time.sleep(0.1)
-                else:
+                if not self._wait_for_exit(1.0):
                     # Force kill if still running
                     os.kill(self.pid, signal.SIGKILL)
                     os.waitpid(self.pid, 0)
@@ -251,6 +511,25 @@ class PTYController:
         """Clean up resources."""
         self.running = False
 
+        # Wake the reader thread and let it exit before closing its fds
+        if self._shutdown_fd is not None:
+            try:
+                os.eventfd_write(self._shutdown_fd, 1)
+            except OSError:
+                pass
+        reader = self._reader_thread
+        if (
+            reader is not None
+            and reader.is_alive()
+            and reader is not threading.current_thread()
+        ):
+            reader.join(timeout=1.0)
+        self._reader_thread = None
+
+        if self._sel is not None:
+            self._sel.close()
+            self._sel = None
+
         if self.master_fd is not None:
             try:
                 os.close(self.master_fd)
@@ -265,6 +544,20 @@ class PTYController:
                 pass
             self.slave_fd = None
 
+        if self._pidfd is not None:
+            try:
+                os.close(self._pidfd)
+            except OSError:
+                pass
+            self._pidfd = None
+
+        if self._shutdown_fd is not None:
+            try:
+                os.close(self._shutdown_fd)
+            except OSError:
+                pass
+            self._shutdown_fd = None
+
         self.pid = None
 
     def restart(self) -> bool:
@@ -274,99 +567,80 @@ class PTYController:
 
 
 class PTYManager:
-    """Manager for PTY controller with session tracking."""
+    """Manager for PTY controller with session tracking.
+
+    Use the module-level ``pty_manager`` instance rather than creating one.
+    """
 
-    _instance: Optional["PTYManager"] = None
-    _controller: Optional[PTYController] = None
-    _session_id: Optional[str] = None
-    _current_dir: Optional[str] = None
+    __slots__ = ("_controller", "_session_id", "_current_dir")
 
-    @classmethod
-    def get_instance(cls) -> "PTYManager":
-        """Get singleton instance."""
-        if cls._instance is None:
-            cls._instance = cls()
-        return cls._instance
+    def __init__(self) -> None:
+        self._controller: Optional[PTYController] = None
+        self._session_id: Optional[str] = None
+        self._current_dir: Optional[str] = None
 
-    @classmethod
     def initialize(
-        cls,
+        self,
         working_dir: str = "/workspace",
         on_output: Optional[Callable[[str], None]] = None,
+        env: Optional[Dict[str, str]] = None,
     ) -> "PTYManager":
         """Initialize the PTY manager."""
-        instance = cls.get_instance()
-        instance._controller = PTYController(working_dir, on_output)
-        return instance
+        self._controller = PTYController(working_dir, on_output, env)
+        return self
 
-    @classmethod
-    def get_controller(cls) -> Optional[PTYController]:
+    def get_controller(self) -> Optional[PTYController]:
         """Get the PTY controller."""
-        instance = cls.get_instance()
-        return instance._controller
+        return self._controller
 
-    @classmethod
-    def start_claude(cls) -> bool:
+    def start_claude(self) -> bool:
         """Start Claude Code."""
-        instance = cls.get_instance()
-        if instance._controller:
-            return instance._controller.start()
+        if self._controller:
+            return self._controller.start()
         return False
 
-    @classmethod
-    def stop_claude(cls) -> None:
+    def stop_claude(self) -> None:
         """Stop Claude Code."""
-        instance = cls.get_instance()
-        if instance._controller:
-            instance._controller.stop()
+        if self._controller:
+            self._controller.stop()
 
-    @classmethod
-    def send_input(cls, text: str) -> bool:
+    def send_input(self, text: str) -> bool:
         """Send input to Claude Code."""
-        instance = cls.get_instance()
-        if instance._controller:
-            return instance._controller.send_input(text)
+        if self._controller:
+            return self._controller.send_input(text)
         return False
 
-    @classmethod
-    def is_running(cls) -> bool:
+    def is_running(self) -> bool:
         """Check if Claude Code is running."""
-        instance = cls.get_instance()
-        if instance._controller:
-            return instance._controller.is_running()
+        if self._controller:
+            return self._controller.is_running()
         return False
 
-    @classmethod
-    def set_session_id(cls, session_id: str) -> None:
+    def set_session_id(self, session_id: str) -> None:
         """Set the session ID."""
-        instance = cls.get_instance()
-        instance._session_id = session_id
+        self._session_id = session_id
 
-    @classmethod
-    def get_session_id(cls) -> Optional[str]:
+    def get_session_id(self) -> Optional[str]:
         """Get the session ID."""
-        instance = cls.get_instance()
-        return instance._session_id
+        return self._session_id
 
-    @classmethod
-    def change_directory(cls, path: str) -> bool:
+    def change_directory(self, path: str) -> bool:
         """Change Claude's working directory."""
-        instance = cls.get_instance()
-        if instance._controller:
-            success = instance._controller.change_directory(path)
+        if self._controller:
+            success = self._controller.change_directory(path)
             if success:
-                instance._current_dir = path
+                self._current_dir = path
             return success
         return False
 
-    @classmethod
-    def get_current_directory(cls) -> Optional[str]:
+    def get_current_directory(self) -> Optional[str]:
         """Get current working directory."""
-        instance = cls.get_instance()
-        return instance._current_dir
+        return self._current_dir
 
-    @classmethod
-    def set_current_directory(cls, path: str) -> None:
+    def set_current_directory(self, path: str) -> None:
         """Set current directory without sending cd command."""
-        instance = cls.get_instance()
-        instance._current_dir = path
+        self._current_dir = path
+
+
+# Process-wide PTY manager
+pty_manager = PTYManager()
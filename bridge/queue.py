@@ -2,10 +2,20 @@
 
 import asyncio
 import logging
-from typing import Callable, Dict, Optional
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Minimum interval between queue depth log lines
+DEPTH_LOG_INTERVAL = 60.0
+
+# Limits for joining pending messages into one input when coalescing
+COALESCE_MAX_MESSAGES = 20
+COALESCE_MAX_BYTES = 8192
+COALESCE_SEPARATOR = "\n\n"
+
 
 class MessageQueue:
     """In-memory queue for handling messages per session.
@@ -18,87 +28,163 @@ class MessageQueue:
         self,
         send_callback: Callable[[str, str], bool],
         delay_between_messages: float = 0.5,
+        maxsize: int = 0,
+        coalesce: bool = False,
     ):
         """Initialize the message queue.
 
         Args:
             send_callback: Function to send message to PTY (session, message) -> success
             delay_between_messages: Delay in seconds between processing messages
+            maxsize: Max pending messages per session, 0 for unbounded
+            coalesce: Join messages pending at the same time into a single
+                input (up to COALESCE_MAX_MESSAGES / COALESCE_MAX_BYTES)
         """
-        self.queues: Dict[str, asyncio.Queue] = {}
+        # Single producer (Slack handler) / single consumer (processor task)
+        # per session, both on the event loop: a deque plus a wakeup event
+        # is all the coordination needed
+        self.queues: Dict[str, Deque[str]] = {}
+        self._events: Dict[str, asyncio.Event] = {}
         self.processors: Dict[str, asyncio.Task] = {}
         self.send_callback = send_callback
         self.delay = delay_between_messages
+        self.maxsize = maxsize
+        self.coalesce = coalesce
         self._running = True
+        self._last_depth_log = 0.0
 
     async def enqueue(self, session_id: str, message: str) -> None:
         """Add message to session queue.
 
-        Creates a new queue and processor if needed.
+        Async wrapper around enqueue_nowait() for existing callers.
+
+        Raises:
+            asyncio.QueueFull: If the session already has maxsize pending messages.
         """
-        if session_id not in self.queues:
-            self.queues[session_id] = asyncio.Queue()
-            self.processors[session_id] = asyncio.create_task(
-                self._process_queue(session_id)
-            )
-            logger.info(f"Created queue for session: {session_id}")
+        self.enqueue_nowait(session_id, message)
+
+    def enqueue_nowait(self, session_id: str, message: str) -> None:
+        """Add message to session queue without awaiting.
 
-        await self.queues[session_id].put(message)
-        logger.debug(f"Enqueued message for session {session_id}: {message[:50]}...")
+        Creates a new queue and processor if needed. Must be called from
+        the event loop thread.
+
+        Raises:
+            asyncio.QueueFull: If the session already has maxsize pending messages.
+        """
+        queue = self.queues.get(session_id)
+        if queue is None:
+            queue = self._create_session(session_id)
+
+        if self.maxsize and len(queue) >= self.maxsize:
+            raise asyncio.QueueFull
+        queue.append(message)
+        self._events[session_id].set()
+        logger.debug("Enqueued message for session %s: %.50s...", session_id, message)
+        self._log_depths()
+
+    def _create_session(self, session_id: str) -> Deque[str]:
+        """Create the queue, wakeup event and processor task for a session."""
+        queue = self.queues[session_id] = deque()
+        self._events[session_id] = asyncio.Event()
+        self.processors[session_id] = asyncio.create_task(
+            self._process_queue(session_id)
+        )
+        logger.info("Created queue for session: %s", session_id)
+        return queue
+
+    def _log_depths(self) -> None:
+        """Periodically log pending message counts for visibility."""
+        now = time.monotonic()
+        if now - self._last_depth_log < DEPTH_LOG_INTERVAL:
+            return
+        self._last_depth_log = now
+        depths = {sid: len(q) for sid, q in self.queues.items()}
+        logger.info("Queue depths: %s", depths)
 
     async def _process_queue(self, session_id: str) -> None:
         """Process messages sequentially for a session."""
-        logger.info(f"Started queue processor for session: {session_id}")
-
+        logger.info("Started queue processor for session: %s", session_id)
+
+        # Bound once: these are read for every message in the loop below
+        queue = self.queues[session_id]
+        event = self._events[session_id]
+        send = self.send_callback
+        delay = self.delay
+        coalesce = self.coalesce
+        take_batch = self._take_batch
+        log_debug = logger.debug
+        log_warning = logger.warning
         while self._running:
             try:
-                # Wait for next message with timeout
-                try:
-                    message = await asyncio.wait_for(
-                        self.queues[session_id].get(), timeout=60.0
-                    )
-                except asyncio.TimeoutError:
-                    continue
-
-                # Send message
-                success = self.send_callback(session_id, message)
-                if success:
-                    logger.debug(f"Sent message to session {session_id}")
-                else:
-                    logger.warning(f"Failed to send message to session {session_id}")
-
-                # Small delay between messages
-                await asyncio.sleep(self.delay)
+                # Sleep until enqueue() signals new messages; messages left
+                # over after an error are picked up without a new signal
+                if not queue:
+                    await event.wait()
+                    event.clear()
+
+                while queue:
+                    if coalesce:
+                        message, count = take_batch(queue)
+                    else:
+                        message, count = queue.popleft(), 1
+
+                    # Send message
+                    success = send(session_id, message)
+                    if success:
+                        log_debug("Sent message to session %s", session_id)
+                    else:
+                        log_warning("Failed to send message to session %s", session_id)
+
+                    # Small delay between messages; a coalesced batch that
+                    # emptied the queue has nothing left to space out
+                    if count == 1 or queue:
+                        await asyncio.sleep(delay)
 
             except asyncio.CancelledError:
-                logger.info(f"Queue processor cancelled for session: {session_id}")
+                logger.info("Queue processor cancelled for session: %s", session_id)
                 break
             except Exception as e:
-                logger.error(f"Error processing queue for {session_id}: {e}")
+                logger.error("Error processing queue for %s: %s", session_id, e)
                 await asyncio.sleep(1.0)  # Back off on error
 
+    @staticmethod
+    def _take_batch(queue: Deque[str]) -> Tuple[str, int]:
+        """Pop pending messages to send as one input.
+
+        Always takes the first message, then keeps taking while the batch
+        stays within COALESCE_MAX_MESSAGES and COALESCE_MAX_BYTES.
+
+        Returns:
+            (joined message, number of messages taken)
+        """
+        batch = [queue.popleft()]
+        size = len(batch[0].encode("utf-8"))
+        sep_size = len(COALESCE_SEPARATOR)
+        while queue and len(batch) < COALESCE_MAX_MESSAGES:
+            next_size = len(queue[0].encode("utf-8"))
+            if size + sep_size + next_size > COALESCE_MAX_BYTES:
+                break
+            batch.append(queue.popleft())
+            size += sep_size + next_size
+        return COALESCE_SEPARATOR.join(batch), len(batch)
+
     def get_queue_size(self, session_id: str) -> int:
         """Get the number of pending messages for a session."""
-        if session_id in self.queues:
-            return self.queues[session_id].qsize()
-        return 0
+        queue = self.queues.get(session_id)
+        return len(queue) if queue is not None else 0
 
     async def clear_queue(self, session_id: str) -> int:
         """Clear all pending messages for a session.
 
         Returns the number of messages cleared.
         """
-        if session_id not in self.queues:
+        queue = self.queues.get(session_id)
+        if queue is None:
             return 0
 
-        count = 0
-        while not self.queues[session_id].empty():
-            try:
-                self.queues[session_id].get_nowait()
-                count += 1
-            except asyncio.QueueEmpty:
-                break
-
+        count = len(queue)
+        queue.clear()
         return count
 
     async def remove_session(self, session_id: str) -> None:
@@ -111,10 +197,10 @@ class MessageQueue:
                 pass
             del self.processors[session_id]
 
-        if session_id in self.queues:
-            del self.queues[session_id]
+        self.queues.pop(session_id, None)
+        self._events.pop(session_id, None)
 
-        logger.info(f"Removed queue for session: {session_id}")
+        logger.info("Removed queue for session: %s", session_id)
 
     async def shutdown(self) -> None:
         """Shutdown all queue processors."""
@@ -1,21 +1,45 @@
 """Session management for Claude Slack Bridge (multi-channel mode)."""
 
 import logging
+import sys
+import time
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+# Wall-clock/monotonic reference pair for converting monotonic activity
+# timestamps to datetimes
+_EPOCH_NS = time.time_ns()
+_MONOTONIC_NS = time.monotonic_ns()
 
-@dataclass
+
+@dataclass(slots=True)
 class ChannelSession:
     """Session info for a single channel."""
 
     channel_id: str
     repo_path: str
-    last_activity: datetime = field(default_factory=datetime.utcnow)
+    # time.monotonic_ns() of the last message; see last_activity for a datetime
+    last_activity_ns: int = field(default_factory=time.monotonic_ns)
     message_count: int = 0
+    # Cached last_activity.isoformat(), cleared whenever activity is updated
+    _last_activity_iso: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def last_activity(self) -> datetime:
+        """Get the time of the last activity as an aware UTC datetime."""
+        epoch_ns = _EPOCH_NS + (self.last_activity_ns - _MONOTONIC_NS)
+        return datetime.fromtimestamp(epoch_ns / 1e9, tz=timezone.utc)
+
+    def last_activity_iso(self) -> str:
+        """Get last_activity as an ISO 8601 string."""
+        if self._last_activity_iso is None:
+            self._last_activity_iso = self.last_activity.isoformat()
+        return self._last_activity_iso
 
 
 class SessionManager:
@@ -28,11 +52,17 @@ class SessionManager:
             channel_configs: Dict of channel_id -> repo_path
         """
         self.sessions: Dict[str, ChannelSession] = {}
-        self.channel_configs = channel_configs
+        # Channel IDs are interned here and at each entry point so the
+        # per-message dict probes reuse cached hashes and compare by identity
+        self.channel_configs = {
+            sys.intern(channel_id): repo_path
+            for channel_id, repo_path in channel_configs.items()
+        }
         self.current_channel: Optional[str] = None
 
     def get_or_create_session(self, channel_id: str) -> Optional[ChannelSession]:
         """Get or create a session for a channel."""
+        channel_id = sys.intern(channel_id)
         if channel_id not in self.channel_configs:
             logger.warning(f"Unknown channel: {channel_id}")
             return None
@@ -49,13 +79,19 @@ class SessionManager:
 
     def update_activity(self, channel_id: str) -> None:
         """Update last activity for a channel."""
-        if channel_id in self.sessions:
-            self.sessions[channel_id].last_activity = datetime.utcnow()
-            self.sessions[channel_id].message_count += 1
+        channel_id = sys.intern(channel_id)
+        session = self.sessions.get(channel_id)
+        if session is not None:
+            session.last_activity_ns = time.monotonic_ns()
+            session._last_activity_iso = None
+            session.message_count += 1
 
     def set_current_channel(self, channel_id: str) -> None:
-        """Set the currently active channel."""
+        """Set the currently active channel, creating its session if needed."""
+        channel_id = sys.intern(channel_id)
         self.current_channel = channel_id
+        if channel_id not in self.sessions:
+            self.get_or_create_session(channel_id)
 
     def get_current_channel(self) -> Optional[str]:
         """Get the currently active channel."""
@@ -63,6 +99,7 @@ class SessionManager:
 
     def get_repo_for_channel(self, channel_id: str) -> Optional[str]:
         """Get the repo path for a channel."""
+        channel_id = sys.intern(channel_id)
         return self.channel_configs.get(channel_id)
 
     def get_session(self, channel_id: str) -> Optional[ChannelSession]:
@@ -2,18 +2,47 @@
 
 import logging
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, Callable, Dict, List, Optional
 
 from slack_bolt import App
 from slack_bolt.adapter.socket_mode import SocketModeHandler
 from slack_sdk.errors import SlackApiError
+from slack_sdk import WebClient
+from slack_sdk.http_retry.builtin_handlers import (
+    ConnectionErrorRetryHandler,
+    RateLimitErrorRetryHandler,
+)
 
 from .channel_registry import ChannelRegistry
 from .config import SlackConfig
 from .formatter import OutputFormatter
+from .post_coalescer import PostCoalescer
 
 logger = logging.getLogger(__name__)
 
+# Seconds a channel name -> ID listing stays valid before a miss re-lists
+CHANNEL_CACHE_TTL = 300.0
+
+# Channels requested per conversations.list page
+CHANNEL_LIST_PAGE_SIZE = 1000
+
+# Concurrent conversations.join calls at startup; kept low to stay within
+# Slack's per-method rate limits
+JOIN_WORKERS = 5
+
+# Seconds before a Slack Web API request times out
+API_TIMEOUT = 30
+
+# Action IDs of the interactive prompt buttons built by post_interactive
+_CHOICE_ACTION_RE = re.compile(r"choice_\d+")
+
+
+def _is_user_message(event: Dict[str, Any]) -> bool:
+    """Bolt matcher: plain messages posted by a person (no bot, no subtype)."""
+    return not event.get("bot_id") and not event.get("subtype")
+
 
 class SlackBridge:
     """Slack client using Socket Mode - no public URL needed."""
@@ -34,35 +63,56 @@ class SlackBridge:
         self.config = config
         self.formatter = formatter
         self.channel_registry = channel_registry
-        self.allowed_users = set(config.allowed_user_ids)
+        self.allowed_users = frozenset(config.allowed_user_ids)
 
         # Initialize Slack app
-        self.app = App(token=config.bot_token)
+        # One Web API client shared by the app and every outbound call; it
+        # retries dropped connections and backs off on HTTP 429 (Retry-After)
+        self.client = WebClient(
+            token=config.bot_token,
+            timeout=API_TIMEOUT,
+            retry_handlers=[
+                ConnectionErrorRetryHandler(max_retry_count=2),
+                RateLimitErrorRetryHandler(max_retry_count=3),
+            ],
+        )
+        self.app = App(client=self.client)
         self.handler = SocketModeHandler(self.app, config.app_token)
 
         # Callback for incoming messages (set by main.py)
         self.on_message_callback: Optional[Callable[[str, str, str], None]] = None
 
+        # Batches plain-text status notices posted in quick succession
+        self._coalescer: Optional[PostCoalescer] = None
+        if config.post_coalesce_ms > 0:
+            self._coalescer = PostCoalescer(
+                self._post_batch,
+                window=config.post_coalesce_ms / 1000,
+                max_messages=config.post_coalesce_max,
+            )
+
+        # Channel name -> ID, filled from conversations.list on a cache miss
+        self._channel_name_cache: Dict[str, str] = {}
+        self._channel_cache_ts: Optional[float] = None
+
         # Register handlers
         self._register_handlers()
 
     def _register_handlers(self) -> None:
         """Register Slack event handlers."""
 
-        @self.app.event("message")
+        # Bot and subtype messages (joins, edits, deletes...) are filtered out
+        # by the matcher before a listener is scheduled for them
+        @self.app.event("message", matchers=[_is_user_message])
         def handle_message(event: Dict[str, Any], say: Callable) -> None:
             """Handle incoming messages from Slack channels."""
-            # Log all incoming events for debugging
+            # Log all incoming events; lazy args since this runs per event
             logger.info(
-                f"Slack event received: channel={event.get('channel')}, "
-                f"user={event.get('user')}, subtype={event.get('subtype')}"
+                "Slack event received: channel=%s, user=%s",
+                event.get("channel"),
+                event.get("user"),
             )
 
-            # Ignore bot messages
-            if event.get("bot_id") or event.get("subtype"):
-                logger.debug("Ignoring bot/subtype message")
-                return
-
             user = event.get("user")
             channel = event.get("channel")
 
@@ -78,7 +128,7 @@ class SlackBridge:
             if self.on_message_callback:
                 self.on_message_callback(channel, user, text)
 
-        @self.app.action(re.compile(r"choice_\d+"))
+        @self.app.action(_CHOICE_ACTION_RE)
         def handle_button(ack: Callable, body: Dict[str, Any], say: Callable) -> None:
             """Handle button clicks for interactive prompts."""
             ack()
@@ -97,6 +147,13 @@ class SlackBridge:
             if self.on_message_callback:
                 self.on_message_callback(channel, user, value)
 
+        @self.app.event("message")
+        def ignore_message() -> None:
+            """Acknowledge the messages handle_message does not match.
+
+            Without a listener Bolt logs every one as an unhandled request.
+            """
+
     def start(self) -> None:
         """Start the Socket Mode connection (blocking)."""
         logger.info("Starting Slack Socket Mode connection...")
@@ -111,6 +168,8 @@ class SlackBridge:
         """Stop the Socket Mode connection."""
         logger.info("Stopping Slack Socket Mode connection...")
         self.handler.close()
+        if self._coalescer:
+            self._coalescer.flush_all()
 
     def is_allowed_user(self, user_id: Optional[str]) -> bool:
         """Check if a user is allowed to interact with the bridge."""
@@ -127,8 +186,8 @@ class SlackBridge:
         """Validate an incoming message/action from Slack.
 
         Checks:
-        - User is in allowed list (or list is empty)
         - Channel is in our registered channels
+        - User is in allowed list (or list is empty)
 
         Args:
             user: User ID from the event
@@ -137,12 +196,14 @@ class SlackBridge:
         Returns:
             True if the message should be processed, False otherwise.
         """
-        if not self.is_allowed_user(user):
-            logger.debug(f"Ignoring action from unauthorized user: {user}")
+        # Channel first: most events the bot sees come from channels the
+        # bridge does not manage
+        if not self.channel_registry.is_registered_channel(channel):
+            logger.debug("Ignoring action from unregistered channel: %s", channel)
             return False
 
-        if not self.channel_registry.is_registered_channel(channel):
-            logger.debug(f"Ignoring action from unregistered channel: {channel}")
+        if self.allowed_users and user not in self.allowed_users:
+            logger.debug("Ignoring action from unauthorized user: %s", user)
             return False
 
         return True
@@ -183,6 +244,32 @@ class SlackBridge:
             logger.error(f"Failed to post message to {channel_id}: {e}")
             return None
 
+    def post_status(
+        self,
+        text: str,
+        channel_id: Optional[str] = None,
+        thread_ts: Optional[str] = None,
+    ) -> None:
+        """Post a short plain-text notice.
+
+        Notices sent to the same channel/thread within post_coalesce_ms are
+        joined into one message, so no timestamp is returned.
+        """
+        if not channel_id:
+            channel_id = self.channel_registry.get_current_channel()
+
+        if not channel_id or not self._coalescer:
+            self.post_message(text, channel_id=channel_id, thread_ts=thread_ts)
+            return
+
+        self._coalescer.add(channel_id, text, thread_ts)
+
+    def _post_batch(
+        self, channel_id: str, text: str, thread_ts: Optional[str]
+    ) -> Optional[str]:
+        """Post a batch of coalesced notices."""
+        return self.post_message(text, channel_id=channel_id, thread_ts=thread_ts)
+
     def post_to_channel(
         self,
         channel_id: str,
@@ -307,6 +394,7 @@ class SlackBridge:
         try:
             response = self.app.client.conversations_create(name=clean_name)
             channel_id = response["channel"]["id"]
+            self._channel_name_cache[clean_name] = channel_id
             logger.info(f"Created channel #{clean_name} ({channel_id})")
             return channel_id
         except SlackApiError as e:
@@ -318,22 +406,68 @@ class SlackBridge:
             return None
 
     def find_channel_by_name(self, name: str) -> Optional[str]:
-        """Find a channel ID by name."""
+        """Find a channel ID by name.
+
+        Served from a cached name -> ID map; a miss re-lists the workspace
+        channels unless the cache is younger than CHANNEL_CACHE_TTL.
+        """
+        channel_id = self._channel_name_cache.get(name)
+        if channel_id is not None:
+            return channel_id
+
+        if (
+            self._channel_cache_ts is not None
+            and time.monotonic() - self._channel_cache_ts < CHANNEL_CACHE_TTL
+        ):
+            return None
+
         try:
-            response = self.app.client.conversations_list(types="public_channel")
-            for channel in response.get("channels", []):
-                if channel["name"] == name:
-                    return channel["id"]
+            self._refresh_channel_cache()
         except SlackApiError as e:
             logger.error(f"Failed to list channels: {e}")
-        return None
+            return None
+        return self._channel_name_cache.get(name)
+
+    def _refresh_channel_cache(self) -> None:
+        """Rebuild the channel name cache from every conversations.list page."""
+        names: Dict[str, str] = {}
+        cursor = None
+        while True:
+            response = self.app.client.conversations_list(
+                types="public_channel",
+                limit=CHANNEL_LIST_PAGE_SIZE,
+                cursor=cursor,
+            )
+            names.update(
+                (channel["name"], channel["id"])
+                for channel in response.get("channels", [])
+            )
+            cursor = (response.get("response_metadata") or {}).get("next_cursor")
+            if not cursor:
+                break
+
+        self._channel_name_cache = names
+        self._channel_cache_ts = time.monotonic()
+        logger.debug("Cached %d channel names", len(names))
 
     def join_all_channels(self) -> Dict[str, bool]:
         """Join all registered channels.
 
         Returns a dict of channel_id -> success status.
         """
-        results = {}
-        for channel_id in self.channel_registry.get_channel_ids():
-            results[channel_id] = self.join_channel(channel_id)
+        results: Dict[str, bool] = {}
+        channel_ids = self.channel_registry.get_channel_ids()
+        if not channel_ids:
+            return results
+
+        with ThreadPoolExecutor(
+            max_workers=min(JOIN_WORKERS, len(channel_ids)),
+            thread_name_prefix="slack-join",
+        ) as executor:
+            futures = {
+                executor.submit(self.join_channel, channel_id): channel_id
+                for channel_id in channel_ids
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
         return results
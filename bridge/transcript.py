@@ -7,13 +7,41 @@ because hooks run as standalone scripts and cannot import from the bridge packag
 Keep both implementations in sync when making changes.
 """
 
-import json
 import logging
-from pathlib import Path
-from typing import Optional
+import mmap
+import os
+from typing import Iterator, Optional
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Present in every assistant transcript entry, whatever the JSON spacing
+_ASSISTANT_MARKER = b'"assistant"'
+
+
+def _iter_reverse_lines(path: str, marker: bytes = b"") -> Iterator[bytes]:
+    """Yield the raw lines of a file that contain marker, from last to first.
+
+    The file is memory-mapped and walked backwards with rfind, so a match
+    near the end of a long transcript only pages in its tail, and lines
+    without marker are skipped without being copied out of the map.
+    """
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return
+
+    with mm:
+        end = len(mm)
+        while end > 0:
+            start = mm.rfind(b"\n", 0, end) + 1
+            if mm.find(marker, start, end) != -1:
+                yield mm[start:end]
+            end = start - 1
+
 
 def get_last_assistant_message(transcript_path: Optional[str]) -> Optional[str]:
     """Extract the last assistant text message from the transcript.
@@ -30,21 +58,12 @@ def get_last_assistant_message(transcript_path: Optional[str]) -> Optional[str]:
     if not transcript_path:
         return None
 
-    path = Path(transcript_path)
-    if not path.exists():
-        return None
-
     try:
-        with open(path, "r") as f:
-            lines = f.readlines()
-
         # Parse JSON lines in reverse to find last assistant message WITH TEXT
-        for line in reversed(lines):
-            line = line.strip()
-            if not line:
-                continue
+        # Cheap byte scan first: only assistant entries are worth parsing
+        for line in _iter_reverse_lines(transcript_path, _ASSISTANT_MARKER):
             try:
-                msg = json.loads(line)
+                msg = orjson.loads(line)
                 if msg.get("type") == "assistant":
                     message = msg.get("message", {})
                     content = message.get("content", [])
@@ -63,8 +82,10 @@ def get_last_assistant_message(transcript_path: Optional[str]) -> Optional[str]:
                     if text_parts:
                         return "\n".join(text_parts)
                     # Otherwise continue looking for a message with text
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 continue
+    except FileNotFoundError:
+        return None
     except (IOError, OSError) as e:
         logger.warning(f"Failed to read transcript file {transcript_path}: {e}")
 
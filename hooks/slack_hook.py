@@ -2,22 +2,53 @@
 """
 Claude Code hook that sends events to the Slack bridge.
 
-Docker PTY mode version - hooks POST to localhost within the container.
+Docker PTY mode version - the hook and the bridge run in the same container.
 
-This script is called by Claude Code hooks (Stop, Notification, PostToolUse)
-and forwards the event to the bridge server via HTTP.
+This script is called by Claude Code hooks (Stop, Notification, PostToolUse).
+It writes each event to the bridge's spool directory and wakes the bridge
+over its Unix socket, then exits without waiting on Slack. If spooling is
+disabled or fails, the event is sent over the Unix socket instead, with
+HTTP to localhost as the last fallback.
 """
 
 import hashlib
 import json
+import mmap
 import os
+import socket
+import struct
 import sys
-import urllib.error
-import urllib.request
+import tempfile
+import time
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    # Much faster on large transcript lines; the hook also runs without it
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 
 # Bridge URL - always localhost in Docker mode
 BRIDGE_URL = os.environ.get("CLAUDE_SLACK_BRIDGE_URL", "http://localhost:9876")
 
+# Bridge Unix socket, tried before HTTP ("" to always use HTTP)
+BRIDGE_SOCKET = os.path.expanduser(
+    os.environ.get("CLAUDE_SLACK_BRIDGE_SOCKET", "~/.claude/hooks/.bridge.sock")
+)
+
+# Spool directory drained by the bridge ("" to send events directly)
+SPOOL_DIR = os.path.expanduser(
+    os.environ.get("CLAUDE_SLACK_BRIDGE_SPOOL", "~/.claude/hooks/spool")
+)
+
+# Socket frame header: payload length as unsigned 32-bit big-endian
+FRAME_HEADER = struct.Struct(">I")
+
+# Seconds to wait for the bridge to accept the hook event
+SEND_TIMEOUT = 5
+
 
 # State files are always in global ~/.claude/hooks to avoid writing to
 # bind-mounted repo directories (which would be visible on the host)
@@ -25,6 +56,9 @@ HOOKS_DIR = os.path.expanduser("~/.claude/hooks")
 STATE_FILE = os.path.join(HOOKS_DIR, ".slack_hook_state")
 CHANNEL_STATE_FILE = os.path.join(HOOKS_DIR, ".current_channel")
 
+# Present in every assistant transcript entry, whatever the JSON spacing
+_ASSISTANT_MARKER = b'"assistant"'
+
 
 def get_state_file() -> str:
     """Get the state file path for deduplication."""
@@ -37,42 +71,106 @@ def get_channel_state_file() -> str:
 
 
 def get_message_hash(message: str) -> str:
-    """Get a hash of the message for deduplication."""
-    return hashlib.md5(message.encode()).hexdigest()
+    """Get a hash of the message for deduplication.
 
+    Only compared against the last sent message; a 128-bit BLAKE2b digest
+    is faster than MD5 and plenty for that.
+    """
+    return hashlib.blake2b(message.encode("utf-8"), digest_size=16).hexdigest()
 
-def is_duplicate_message(message: str) -> bool:
-    """Check if this message was already sent."""
-    if not message:
-        return True
 
-    current_hash = get_message_hash(message)
+def load_state() -> Dict[str, Any]:
+    """Load the hook state.
+
+    The state file holds a JSON object with the hash of the last sent
+    message (msg_hash) and the last message extracted from a transcript,
+    keyed by the transcript's path, size and mtime_ns.
+    """
     state_file = get_state_file()
+    try:
+        fd = os.open(state_file, os.O_RDONLY)
+    except FileNotFoundError:
+        return {}
+    except OSError as e:
+        print(f"Warning: Failed to read dedup state file: {e}", file=sys.stderr)
+        return {}
 
     try:
-        if os.path.exists(state_file):
-            with open(state_file, "r") as f:
-                last_hash = f.read().strip()
-                if last_hash == current_hash:
-                    return True
-    except (IOError, OSError) as e:
+        # save_state publishes the file by rename, so one read of the
+        # stat'd size sees a complete file
+        data = os.read(fd, max(os.fstat(fd).st_size, 1))
+    except OSError as e:
         print(f"Warning: Failed to read dedup state file: {e}", file=sys.stderr)
+        return {}
+    finally:
+        os.close(fd)
 
-    return False
+    try:
+        state = json.loads(data)
+    except ValueError:
+        state = None
+    if isinstance(state, dict):
+        return state
+    # Older state files contain only the last message hash
+    return {"msg_hash": data.decode("utf-8", "replace").strip()}
 
 
-def mark_message_sent(message: str) -> None:
-    """Mark a message as sent to avoid duplicates."""
-    if not message:
-        return
+def save_state(state: Dict[str, Any]) -> None:
+    """Atomically replace the hook state file.
 
+    The state is written to a unique temp file in the same directory and
+    renamed over the old file, so concurrent readers never see a torn write.
+    """
     state_file = get_state_file()
+    state_dir = os.path.dirname(state_file)
+    tmp_file = None
     try:
-        os.makedirs(os.path.dirname(state_file), exist_ok=True)
-        with open(state_file, "w") as f:
-            f.write(get_message_hash(message))
+        os.makedirs(state_dir, exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(dir=state_dir, prefix=".slack_hook_state.")
+        try:
+            os.write(fd, json.dumps(state).encode("utf-8"))
+        finally:
+            os.close(fd)
+        os.replace(tmp_file, state_file)
     except (IOError, OSError) as e:
         print(f"Warning: Failed to write dedup state file: {e}", file=sys.stderr)
+        if tmp_file:
+            try:
+                os.unlink(tmp_file)
+            except OSError:
+                pass
+
+
+def is_duplicate_message(msg_hash: str, state: Dict[str, Any]) -> bool:
+    """Check if the message with this hash was already sent."""
+    return state.get("msg_hash") == msg_hash
+
+
+def mark_message_sent(msg_hash: str, state: Dict[str, Any]) -> None:
+    """Mark the message with this hash as sent to avoid duplicates."""
+    state["msg_hash"] = msg_hash
+    save_state(state)
+
+
+def get_transcript_message(transcript_path: str, state: Dict[str, Any]) -> str:
+    """Get the last assistant message, reusing the cached one if unchanged.
+
+    The transcript is only parsed when its path, size or mtime differ from
+    the cached entry in state, which is updated in place (not saved).
+    """
+    try:
+        st = os.stat(transcript_path)
+    except OSError:
+        return ""
+
+    key = [transcript_path, st.st_size, st.st_mtime_ns]
+    if state.get("transcript") == key:
+        return state.get("message", "")
+
+    message = get_last_assistant_message(transcript_path)
+    state["transcript"] = key
+    state["message"] = message
+    return message
 
 
 def get_current_channel() -> str:
@@ -83,34 +181,53 @@ def get_current_channel() -> str:
     """
     channel_state_file = get_channel_state_file()
     try:
-        if os.path.exists(channel_state_file):
-            with open(channel_state_file, "r") as f:
-                return f.read().strip()
+        with open(channel_state_file, "r") as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        pass
     except (IOError, OSError) as e:
         print(f"Warning: Failed to read channel state: {e}", file=sys.stderr)
     return ""
 
 
+def _iter_reverse_lines(path: str, marker: bytes = b"") -> Iterator[bytes]:
+    """Yield the raw lines of a file that contain marker, from last to first.
+
+    The file is memory-mapped and walked backwards with rfind, so a match
+    near the end of a long transcript only pages in its tail, and lines
+    without marker are skipped without being copied out of the map.
+    """
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return
+
+    with mm:
+        end = len(mm)
+        while end > 0:
+            start = mm.rfind(b"\n", 0, end) + 1
+            if mm.find(marker, start, end) != -1:
+                yield mm[start:end]
+            end = start - 1
+
+
 def get_last_assistant_message(transcript_path: str) -> str:
     """Extract the last assistant text message from the transcript.
 
     Looks for the most recent assistant message that contains actual text
     (not just tool_use blocks).
     """
-    if not transcript_path or not os.path.exists(transcript_path):
+    if not transcript_path:
         return ""
 
     try:
-        with open(transcript_path, "r") as f:
-            lines = f.readlines()
-
         # Parse JSON lines in reverse to find last assistant message WITH TEXT
-        for line in reversed(lines):
-            line = line.strip()
-            if not line:
-                continue
+        # Cheap byte scan first: only assistant entries are worth parsing
+        for line in _iter_reverse_lines(transcript_path, _ASSISTANT_MARKER):
             try:
-                msg = json.loads(line)
+                msg = _loads(line)
                 if msg.get("type") == "assistant":
                     message = msg.get("message", {})
                     content = message.get("content", [])
@@ -129,19 +246,136 @@ def get_last_assistant_message(transcript_path: str) -> str:
                     if text_parts:
                         return "\n".join(text_parts)
                     # Otherwise continue looking for a message with text
-            except json.JSONDecodeError:
+            except (json.JSONDecodeError, UnicodeDecodeError):
                 continue
+    except FileNotFoundError:
+        return ""
     except (IOError, OSError) as e:
         print(f"Warning: Failed to read transcript file: {e}", file=sys.stderr)
 
     return ""
 
 
+def spool_event(payload: bytes) -> bool:
+    """Hand the hook payload to the bridge through its spool directory.
+
+    The file is written under a temporary name and renamed into place, so
+    the bridge never sees a partial event. Returns True if spooled.
+    """
+    if not SPOOL_DIR:
+        return False
+
+    name = f"{time.time_ns()}-{os.getpid()}"
+    tmp_path = os.path.join(SPOOL_DIR, f".{name}.tmp")
+    try:
+        os.makedirs(SPOOL_DIR, mode=0o700, exist_ok=True)
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.rename(tmp_path, os.path.join(SPOOL_DIR, f"{name}.json"))
+        return True
+    except OSError as e:
+        print(f"Warning: Failed to spool hook event: {e}", file=sys.stderr)
+        return False
+
+
+def wake_bridge() -> None:
+    """Ask the bridge to drain the spool now (best effort, no reply)."""
+    if not BRIDGE_SOCKET:
+        return
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(SEND_TIMEOUT)
+            sock.connect(BRIDGE_SOCKET)
+            sock.sendall(FRAME_HEADER.pack(0))
+    except OSError:
+        # The bridge also polls the spool, so it will still pick it up
+        pass
+
+
+def send_via_socket(payload: bytes) -> Optional[bool]:
+    """Send the hook payload over the bridge's Unix socket.
+
+    Returns:
+        Whether the bridge accepted the event, or None if the socket is not
+        available (the caller should fall back to HTTP).
+    """
+    if not BRIDGE_SOCKET:
+        return None
+
+    try:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    except OSError:
+        return None
+
+    with sock:
+        sock.settimeout(SEND_TIMEOUT)
+        try:
+            sock.connect(BRIDGE_SOCKET)
+        except OSError:
+            return None
+
+        try:
+            sock.sendall(FRAME_HEADER.pack(len(payload)) + payload)
+            header = _recv_exactly(sock, FRAME_HEADER.size)
+            (length,) = FRAME_HEADER.unpack(header)
+            reply = _loads(_recv_exactly(sock, length))
+        except (OSError, ValueError) as e:
+            print(f"Warning: Failed to send hook over {BRIDGE_SOCKET}: {e}", file=sys.stderr)
+            return False
+
+    return reply.get("code") == 200
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    """Receive exactly size bytes from sock."""
+    buf = bytearray()
+    while len(buf) < size:
+        chunk = sock.recv(size - len(buf))
+        if not chunk:
+            raise ConnectionError("bridge closed the connection")
+        buf += chunk
+    return bytes(buf)
+
+
+def send_via_http(payload: bytes) -> bool:
+    """POST the hook payload to the bridge. Returns True on success."""
+    # Imported here: urllib.request is slow to import and usually unused
+    import urllib.error
+    import urllib.request
+
+    try:
+        headers = {"Content-Type": "application/json"}
+        # Add API key if configured
+        api_key = os.environ.get("CLAUDE_SLACK_BRIDGE_API_KEY")
+        if api_key:
+            headers["X-API-Key"] = api_key
+
+        req = urllib.request.Request(
+            f"{BRIDGE_URL}/hook",
+            data=payload,
+            headers=headers,
+            method="POST",
+        )
+        urllib.request.urlopen(req, timeout=SEND_TIMEOUT)
+        return True
+    except urllib.error.URLError as e:
+        print(f"Warning: Failed to connect to bridge at {BRIDGE_URL}: {e}", file=sys.stderr)
+    except Exception as e:
+        print(f"Warning: Unexpected error sending hook: {e}", file=sys.stderr)
+    return False
+
+
 def main():
     """Main hook handler."""
     # Read hook input from stdin
     try:
-        hook_input = json.load(sys.stdin)
+        hook_input = _loads(sys.stdin.buffer.read())
     except json.JSONDecodeError:
         sys.exit(0)
 
@@ -151,14 +385,20 @@ def main():
         print(json.dumps({"continue": False}))
         sys.exit(0)
 
-    # Extract the actual Claude response from transcript
+    # Extract the actual Claude response from transcript (or the cache)
+    state = load_state()
+    cached_key = state.get("transcript")
     transcript_path = hook_input.get("transcript_path", "")
     message = ""
     if transcript_path:
-        message = get_last_assistant_message(transcript_path)
+        message = get_transcript_message(transcript_path, state)
 
     # Check for duplicate - don't send same message twice
-    if not message or is_duplicate_message(message):
+    msg_hash = get_message_hash(message) if message else ""
+    if not message or is_duplicate_message(msg_hash, state):
+        if state.get("transcript") != cached_key:
+            # Remember the parse so the next hook can skip it
+            save_state(state)
         print(json.dumps({"continue": False}))
         sys.exit(0)
 
@@ -167,27 +407,20 @@ def main():
     hook_input["stop_hook_message"] = message
     hook_input["target_channel"] = get_current_channel()  # Channel to route response to
 
-    # POST to bridge (localhost in Docker)
-    try:
-        headers = {"Content-Type": "application/json"}
-        # Add API key if configured
-        api_key = os.environ.get("CLAUDE_SLACK_BRIDGE_API_KEY")
-        if api_key:
-            headers["X-API-Key"] = api_key
-
-        req = urllib.request.Request(
-            f"{BRIDGE_URL}/hook",
-            data=json.dumps(hook_input).encode("utf-8"),
-            headers=headers,
-            method="POST",
-        )
-        urllib.request.urlopen(req, timeout=5)
-        # Mark as sent only if POST succeeded
-        mark_message_sent(message)
-    except urllib.error.URLError as e:
-        print(f"Warning: Failed to connect to bridge at {BRIDGE_URL}: {e}", file=sys.stderr)
-    except Exception as e:
-        print(f"Warning: Unexpected error sending hook: {e}", file=sys.stderr)
+    # Spool for the bridge and return without waiting on it or Slack; if
+    # spooling fails, send directly over the Unix socket or HTTP on localhost
+    payload = json.dumps(hook_input).encode("utf-8")
+    if spool_event(payload):
+        wake_bridge()
+        sent = True
+    else:
+        sent = send_via_socket(payload)
+        if sent is None:
+            sent = send_via_http(payload)
+
+    # Mark as sent once the bridge accepted (or will deliver) it
+    if sent:
+        mark_message_sent(msg_hash, state)
 
     # Output JSON to allow Claude to continue
     print(json.dumps({"continue": False}))
@@ -38,4 +38,4 @@ echo ""
 
 # Start the bridge
 echo "Starting bridge on port 9876..."
-exec python -m uvicorn bridge.main:app --host 0.0.0.0 --port 9876
+exec python -m uvicorn bridge.main:app --host 0.0.0.0 --port 9876 --loop uvloop
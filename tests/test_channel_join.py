@@ -0,0 +1,79 @@
+"""Tests for joining configured channels at startup."""
+
+import unittest
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+from bridge.channel_registry import ChannelRegistry
+from bridge.config import ChannelConfig
+from bridge.main import join_configured_channels
+from bridge.slack_client import SlackBridge
+
+
+class FakeSlackBridge:
+    """Records join/create calls; joins only the channels in joinable."""
+
+    def __init__(self, joinable: List[str], created: Dict[str, Optional[str]]):
+        self.joinable = joinable
+        self.created = created
+        self.create_calls: List[str] = []
+
+    def join_all_channels(self) -> Dict[str, bool]:
+        return {cid: cid in self.joinable for cid in ("C1", "C2", "C3")}
+
+    def create_channel(self, name: str) -> Optional[str]:
+        self.create_calls.append(name)
+        return self.created.get(name)
+
+
+class JoinConfiguredChannelsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.channels = {
+            "C1": ChannelConfig(repo="/workspace/one", name="one"),
+            "C2": ChannelConfig(repo="/workspace/two", name="two"),
+            "C3": ChannelConfig(repo="/workspace/three"),
+        }
+        self.registry = ChannelRegistry()
+        self.channel_configs = {cid: cfg.repo for cid, cfg in self.channels.items()}
+
+    def test_creates_only_channels_that_failed_to_join(self) -> None:
+        bridge = FakeSlackBridge(joinable=["C1"], created={"two": "C9"})
+
+        join_configured_channels(
+            bridge, self.channels, self.registry, self.channel_configs
+        )
+
+        # C3 has no name, so it cannot be created
+        self.assertEqual(bridge.create_calls, ["two"])
+        self.assertTrue(self.registry.is_registered_channel("C9"))
+        self.assertEqual(self.registry.get_repo_for_channel("C9"), "/workspace/two")
+        self.assertEqual(self.channel_configs["C9"], "/workspace/two")
+
+    def test_failed_create_registers_nothing(self) -> None:
+        bridge = FakeSlackBridge(joinable=[], created={})
+
+        join_configured_channels(
+            bridge, self.channels, self.registry, self.channel_configs
+        )
+
+        self.assertEqual(bridge.create_calls, ["one", "two"])
+        self.assertEqual(self.registry.get_channel_ids(), [])
+        self.assertEqual(set(self.channel_configs), {"C1", "C2", "C3"})
+
+
+class JoinAllChannelsTest(unittest.TestCase):
+    def test_collects_result_per_registered_channel(self) -> None:
+        registry = ChannelRegistry()
+        for cid in ("C1", "C2", "C3"):
+            registry.register_channel(cid, f"/workspace/{cid}")
+        bridge = SimpleNamespace(
+            channel_registry=registry, join_channel=lambda cid: cid != "C2"
+        )
+
+        results = SlackBridge.join_all_channels(bridge)
+
+        self.assertEqual(results, {"C1": True, "C2": False, "C3": True})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""Tests for channel registry lookups."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from bridge import channel_registry
+from bridge.channel_registry import ChannelRegistry
+
+
+class QueueKeyTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.registry = ChannelRegistry()
+
+    def test_registered_channel_uses_precomputed_key(self) -> None:
+        self.registry.register_channel("C1", "/workspace/one")
+        key = self.registry.get_queue_key("C1")
+        self.assertEqual(key, "channel-C1")
+        self.assertIs(self.registry.get_queue_key("C1"), key)
+
+    def test_unregistered_channel_key_is_cached(self) -> None:
+        key = self.registry.get_queue_key("C2")
+        self.assertEqual(key, "channel-C2")
+        self.assertIs(self.registry.get_queue_key("C2"), key)
+
+
+class ChannelStateFileTest(unittest.TestCase):
+    def setUp(self) -> None:
+        state_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, state_dir)
+        self.state_file = os.path.join(state_dir, ".current_channel")
+        self.enterContext(
+            mock.patch.object(
+                channel_registry, "GLOBAL_CHANNEL_STATE_FILE", self.state_file
+            )
+        )
+        self.registry = ChannelRegistry()
+        self.addCleanup(self.registry._close_state_fd)
+
+    def read_state(self) -> str:
+        with open(self.state_file) as f:
+            return f.read()
+
+    def test_rewrites_state_in_place(self) -> None:
+        self.registry._write_channel_state("C1234567")
+        self.registry._write_channel_state("C2")
+        self.assertEqual(self.read_state(), "C2")
+
+    def test_recreates_deleted_state_file(self) -> None:
+        self.registry._write_channel_state("C1")
+        os.unlink(self.state_file)
+
+        self.registry._write_channel_state("C2")
+
+        self.assertEqual(self.read_state(), "C2")
+
+    def test_follows_replaced_state_file(self) -> None:
+        self.registry._write_channel_state("C1")
+        replacement = self.state_file + ".new"
+        with open(replacement, "w") as f:
+            f.write("stale")
+        os.replace(replacement, self.state_file)
+
+        self.registry._write_channel_state("C2")
+
+        self.assertEqual(self.read_state(), "C2")
+
+
+if __name__ == "__main__":
+    unittest.main()
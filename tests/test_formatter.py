@@ -0,0 +1,67 @@
+"""Tests for markdown -> Slack mrkdwn conversion."""
+
+import unittest
+
+from bridge.config import FormattingConfig
+from bridge.formatter import OutputFormatter
+
+
+class ConvertToSlackMrkdwnTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.formatter = OutputFormatter(FormattingConfig())
+
+    def convert(self, content: str) -> str:
+        return self.formatter._convert_to_slack_mrkdwn(content)
+
+    def test_header(self) -> None:
+        self.assertEqual(self.convert("## Title"), "*Title*")
+
+    def test_bold(self) -> None:
+        self.assertEqual(self.convert("a **b** c"), "a *b* c")
+
+    def test_link(self) -> None:
+        self.assertEqual(self.convert("[docs](http://x)"), "<http://x|docs>")
+
+    def test_header_with_link(self) -> None:
+        self.assertEqual(self.convert("# See [docs](http://x)"), "*See <http://x|docs>*")
+
+    def test_link_inside_bold(self) -> None:
+        self.assertEqual(self.convert("**[docs](http://x)**"), "*<http://x|docs>*")
+
+    def test_link_inside_bold_text(self) -> None:
+        self.assertEqual(self.convert("**a [b](c) d**"), "*a <c|b> d*")
+
+    def test_bold_inside_link_text(self) -> None:
+        self.assertEqual(self.convert("[**x**](u)"), "<u|*x*>")
+
+
+class BlockBuilderTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.formatter = OutputFormatter(FormattingConfig())
+
+    def test_error_blocks_are_not_shared(self) -> None:
+        blocks = self.formatter.format_error("boom")
+        blocks[0]["text"]["text"] = "changed"
+        blocks.append({})
+
+        self.assertEqual(
+            self.formatter.format_error("boom"),
+            [
+                {
+                    "type": "section",
+                    "text": {"type": "mrkdwn", "text": ":x: *Error*\n\n```boom```"},
+                }
+            ],
+        )
+
+    def test_session_created_blocks_are_not_shared(self) -> None:
+        blocks = self.formatter.format_session_created("s", "C1")
+        blocks[1]["elements"].clear()
+
+        fresh = self.formatter.format_session_created("s", "C1")
+        self.assertEqual(len(fresh), 2)
+        self.assertEqual(len(fresh[1]["elements"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+"""Tests for Slack message hand-off in the bridge app."""
+
+import asyncio
+import unittest
+from unittest import mock
+
+from bridge import main
+
+
+class HandleSlackMessageTest(unittest.IsolatedAsyncioTestCase):
+    async def test_processing_error_is_logged(self) -> None:
+        async def fail(channel: str, user: str, text: str) -> None:
+            raise OSError("Slack unreachable")
+
+        loop = asyncio.get_running_loop()
+        with mock.patch.object(main, "main_event_loop", loop), mock.patch.object(
+            main, "process_slack_message", fail
+        ), self.assertLogs(main.logger, "ERROR") as logs:
+            await asyncio.to_thread(main.handle_slack_message, "C1", "U1", "hi")
+            for _ in range(20):
+                await asyncio.sleep(0.01)
+                if logs.records:
+                    break
+
+        self.assertIn("Error processing Slack message", logs.output[0])
+        self.assertIsInstance(logs.records[0].exc_info[1], OSError)
+
+
+if __name__ == "__main__":
+    unittest.main()
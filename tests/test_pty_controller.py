@@ -0,0 +1,94 @@
+"""Tests for the Claude PTY controller."""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from bridge import pty_controller
+from bridge.pty_controller import PTYController
+
+
+class RestartAfterExitTest(unittest.TestCase):
+    def setUp(self) -> None:
+        # Stand-in "claude" that exits shortly after starting
+        self.bin_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.bin_dir)
+        script = os.path.join(self.bin_dir, "claude")
+        with open(script, "w") as f:
+            f.write("#!/bin/sh\nsleep 0.2\n")
+        os.chmod(script, 0o755)
+        path = f"{self.bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"
+        self.enterContext(mock.patch.dict(os.environ, {"PATH": path}))
+        self.enterContext(mock.patch.object(pty_controller, "STARTUP_TIMEOUT", 0.05))
+
+    def run_until_exit(self, controller: PTYController) -> None:
+        self.assertTrue(controller.start())
+        deadline = time.monotonic() + 5
+        while controller.is_running() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertFalse(controller.is_running())
+
+    def test_restart_releases_previous_fds(self) -> None:
+        controller = PTYController(working_dir=self.bin_dir)
+        self.addCleanup(controller.stop)
+
+        self.run_until_exit(controller)
+        baseline = len(os.listdir("/proc/self/fd"))
+        for _ in range(3):
+            self.run_until_exit(controller)
+
+        self.assertEqual(len(os.listdir("/proc/self/fd")), baseline)
+
+
+class StartupDialogTest(unittest.TestCase):
+    def setUp(self) -> None:
+        read_fd, write_fd = os.pipe()
+        self.addCleanup(os.close, read_fd)
+        self.addCleanup(os.close, write_fd)
+        self.read_fd = read_fd
+        self.controller = PTYController()
+        self.controller.master_fd = write_fd
+        self.controller._startup_pending = list(pty_controller.STARTUP_PROMPTS)
+
+    def test_marker_styled_with_escape_sequences_is_answered(self) -> None:
+        self.controller._answer_startup_dialogs(
+            "\x1b[1mYes,\x1b[0m\x1b[1Cproceed\x1b[?25l"
+        )
+
+        self.assertEqual(os.read(self.read_fd, 16), b"\r")
+        self.assertEqual(
+            [name for _, _, name in self.controller._startup_pending],
+            ["API key dialog"],
+        )
+
+    def test_marker_split_across_reads_is_answered(self) -> None:
+        self.controller._answer_startup_dialogs("Yes, \x1b[3")
+        self.controller._answer_startup_dialogs("2mproceed")
+
+        self.assertEqual(os.read(self.read_fd, 16), b"\r")
+
+
+class SendInputTest(unittest.TestCase):
+    def test_write_gives_up_when_child_stops_reading(self) -> None:
+        read_fd, write_fd = os.pipe()
+        self.addCleanup(os.close, read_fd)
+        self.addCleanup(os.close, write_fd)
+        os.set_blocking(write_fd, False)
+        controller = PTYController()
+        controller.master_fd = write_fd
+        controller.running = True
+
+        # Nothing reads the pipe, so it fills up and stays full
+        with mock.patch.object(pty_controller, "WRITE_TIMEOUT", 0.2):
+            started = time.monotonic()
+            sent = controller.send_input("x" * (1 << 20), submit_delay=0)
+
+        self.assertFalse(sent)
+        self.assertLess(time.monotonic() - started, 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
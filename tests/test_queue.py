@@ -0,0 +1,36 @@
+"""Tests for the per-session message queue."""
+
+import asyncio
+import unittest
+from typing import List
+
+from bridge.queue import MessageQueue
+
+
+class ProcessQueueTest(unittest.IsolatedAsyncioTestCase):
+    async def test_drains_remaining_messages_after_send_error(self) -> None:
+        sent: List[str] = []
+
+        def send(session_id: str, message: str) -> bool:
+            if not sent:
+                sent.append("error")
+                raise RuntimeError("PTY write failed")
+            sent.append(message)
+            return True
+
+        queue = MessageQueue(send, delay_between_messages=0)
+        for message in ("a", "b", "c"):
+            queue.enqueue_nowait("s", message)
+
+        # The processor backs off 1s after the error, then keeps draining
+        for _ in range(30):
+            await asyncio.sleep(0.1)
+            if len(sent) == 3:
+                break
+        await queue.shutdown()
+
+        self.assertEqual(sent, ["error", "b", "c"])
+
+
+if __name__ == "__main__":
+    unittest.main()